@@ -0,0 +1,92 @@
+"""Micro-benchmark of the response decode path.
+
+Examples::
+
+    python benchmarks/bench_codec.py
+    python benchmarks/bench_codec.py --number 500000
+
+Compares decoding the typical CloudWiNet bodies through the original text
+round trip (``bytes.decode`` then ``json.loads``) with ``codec.decode``/
+``codec.result``, both with the installed backend and with the standard
+library fallback the codec uses when orjson is missing.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import importlib.util
+import json
+import sys
+import timeit
+
+from common import PACKAGE, PACKAGE_DIR, load_integration
+
+PAYLOADS = {
+    "GetStatus": (
+        b'{"Error":0,"ErrorDescription":"","Result":null,"Status":3,'
+        b'"StatusDescription":"WORK","Success":true}'
+    ),
+    "GetTemperature": b'{"Error":0,"ErrorDescription":"","Result":21,"Success":true}',
+    "GetActualTemperature": (
+        b'{"Error":0,"ErrorDescription":"","Result":20.4,"Success":true}'
+    ),
+}
+
+
+def _text_path(body: bytes):
+    text = body.decode("utf-8", errors="replace")
+    data = json.loads(text)
+    if not data.get("Success", False):
+        raise RuntimeError(text)
+    return data.get("Result")
+
+
+def _bytes_path(codec):
+    def run(body: bytes):
+        payload = codec.decode(body)
+        if not codec.is_success(payload):
+            raise RuntimeError(codec.excerpt(body))
+        return payload if payload.get("Result") is None else codec.result(payload)
+
+    return run
+
+
+def _stdlib_codec():
+    """A separate copy of ``codec`` loaded as if orjson were not installed."""
+    saved = sys.modules.get("orjson")
+    sys.modules["orjson"] = None  # makes ``import orjson`` raise ImportError
+    try:
+        spec = importlib.util.spec_from_file_location(
+            f"{PACKAGE}._codec_stdlib", PACKAGE_DIR / "codec.py"
+        )
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        if saved is None:
+            del sys.modules["orjson"]
+        else:
+            sys.modules["orjson"] = saved
+    return module
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=200_000, help="decodes per case")
+    args = parser.parse_args()
+
+    load_integration()
+    codec = importlib.import_module(f"{PACKAGE}.codec")
+    paths = {"text+json": _text_path, f"bytes+{codec.BACKEND}": _bytes_path(codec)}
+    if codec.BACKEND != "json":
+        paths["bytes+json"] = _bytes_path(_stdlib_codec())
+
+    print(f"{'endpoint':<22} {'path':<14} {'ns/decode':>10}")
+    for endpoint, body in PAYLOADS.items():
+        for name, path in paths.items():
+            seconds = timeit.timeit(lambda: path(body), number=args.number)
+            print(f"{endpoint:<22} {name:<14} {seconds / args.number * 1e9:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""Benchmark the poll path against the in-process CloudWiNet stand-in.
+
+Examples::
+
+    python benchmarks/bench_poll.py --stoves 1 10 100 500
+    python benchmarks/bench_poll.py --stoves 100 --latency 0.2 --jitter 0.15 --error-rate 0.02
+    python benchmarks/bench_poll.py --mode coordinator --stoves 50   # needs homeassistant
+
+``client`` mode drives ``RavelliSmartWifiClient`` only and runs without Home
+Assistant. ``coordinator`` mode runs ``RavelliCoordinator.async_refresh`` on a
+bare ``HomeAssistant`` core, so it also covers the coordinator's processing.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib
+import tempfile
+import time
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, List
+
+import aiohttp
+
+from common import PACKAGE, ResourceTimer, load_integration, ms, percentiles
+from fake_cloudwinet import FakeCloudConfig, FakeCloudWiNet
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mode", choices=("client", "coordinator"), default="client")
+    parser.add_argument("--stoves", type=int, nargs="+", default=[1, 10, 100, 500])
+    parser.add_argument("--rounds", type=int, default=5, help="polls per stove")
+    parser.add_argument("--concurrency", type=int, default=4, help="polls in flight")
+    parser.add_argument("--interval", type=float, default=0.0, help="pause between rounds (s)")
+    parser.add_argument("--slow-refresh", type=float, default=300.0, help="slow tier age (s)")
+    parser.add_argument(
+        "--rate-limit", type=float, default=0.0, help="host requests/s, 0 disables"
+    )
+    parser.add_argument(
+        "--circuit", action="store_true", help="enable the per-host circuit breaker"
+    )
+    parser.add_argument("--hedge", action="store_true", help="enable hedged reads")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--tail-rate", type=float, default=0.0, help="share of slow requests")
+    parser.add_argument("--tail-latency", type=float, default=1.0, help="extra delay (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Success=false rate")
+    parser.add_argument("--http-error-rate", type=float, default=0.0)
+    parser.add_argument("--invalid-json-rate", type=float, default=0.0)
+    return parser.parse_args()
+
+
+async def _drive(
+    pollers: List[Callable[[], Awaitable[Any]]], rounds: int, concurrency: int, interval: float
+) -> tuple[List[float], int]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    failures = 0
+
+    async def _one(poll: Callable[[], Awaitable[Any]]) -> None:
+        nonlocal failures
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await poll()
+            except Exception:
+                failures += 1
+            latencies.append(time.perf_counter() - started)
+
+    for round_index in range(rounds):
+        await asyncio.gather(*(_one(poll) for poll in pollers))
+        if interval and round_index < rounds - 1:
+            await asyncio.sleep(interval)
+    return latencies, failures
+
+
+def _rate_limits(args):
+    ratelimit = importlib.import_module(f"{PACKAGE}.ratelimit")
+    const = importlib.import_module(f"{PACKAGE}.const")
+    return ratelimit.RateLimiterRegistry(
+        args.rate_limit, const.HOST_RATE_BURST, const.HOST_POLL_MAX_DELAY
+    )
+
+
+def _circuits(args):
+    circuit = importlib.import_module(f"{PACKAGE}.circuit")
+    const = importlib.import_module(f"{PACKAGE}.const")
+    # Without --circuit, injected failures never open the breaker.
+    threshold = const.CIRCUIT_FAILURE_THRESHOLD if args.circuit else 2**31
+    return circuit.CircuitBreakerRegistry(
+        threshold, const.CIRCUIT_COOLDOWN, const.CIRCUIT_MAX_COOLDOWN
+    )
+
+
+async def _client_pollers(count: int, base_url: str, args, session) -> List[Callable]:
+    api = importlib.import_module(f"{PACKAGE}.api")
+    # Rounds follow each other immediately; do not let the single-flight
+    # freshness window turn them into cache hits.
+    api._SINGLE_FLIGHT = api._SingleFlight(0.0)
+    api._RATE_LIMITS = _rate_limits(args)
+    api._CIRCUITS = _circuits(args)
+    clients = [
+        api.RavelliSmartWifiClient(
+            session,
+            base_url,
+            f"bench-{index:05d}",
+            slow_refresh_interval=args.slow_refresh,
+            hedged_reads=args.hedge,
+        )
+        for index in range(count)
+    ]
+    return [client.async_get_status for client in clients]
+
+
+async def _coordinator_pollers(count: int, base_url: str, args, hass) -> List[Callable]:
+    const = importlib.import_module(f"{PACKAGE}.const")
+    api = importlib.import_module(f"{PACKAGE}.api")
+    coordinator_module = importlib.import_module(f"{PACKAGE}.coordinator")
+    api._SINGLE_FLIGHT = api._SingleFlight(0.0)
+    api._RATE_LIMITS = _rate_limits(args)
+    api._CIRCUITS = _circuits(args)
+    coordinators = []
+    for index in range(count):
+        entry = SimpleNamespace(
+            entry_id=f"bench{index:05d}",
+            title=f"Bench {index}",
+            data={const.CONF_TOKEN: f"bench-{index:05d}", const.CONF_BASE_URL: base_url},
+            options={
+                const.CONF_HEDGED_READS: args.hedge,
+                # The coordinator applies it to the host limiter set up above.
+                const.CONF_HOST_RATE_LIMIT: args.rate_limit or const.HOST_RATE_LIMIT,
+            },
+        )
+        coordinator = coordinator_module.RavelliCoordinator(hass, entry)
+        coordinator.client._slow_refresh_interval = args.slow_refresh
+        coordinators.append(coordinator)
+
+    async def _refresh(coordinator) -> None:
+        await coordinator.async_refresh()
+        if not coordinator.last_update_success:
+            raise RuntimeError(coordinator.last_exception)
+
+    return [lambda c=coordinator: _refresh(c) for coordinator in coordinators]
+
+
+async def _run_size(count: int, args) -> dict:
+    cloud = FakeCloudWiNet(
+        FakeCloudConfig(
+            latency=args.latency,
+            jitter=args.jitter,
+            tail_rate=args.tail_rate,
+            tail_latency=args.tail_latency,
+            error_rate=args.error_rate,
+            http_error_rate=args.http_error_rate,
+            invalid_json_rate=args.invalid_json_rate,
+        )
+    )
+    base_url = await cloud.start()
+    hass = session = None
+    try:
+        if args.mode == "coordinator":
+            from homeassistant.core import HomeAssistant
+
+            hass = HomeAssistant(tempfile.mkdtemp(prefix="ravelli-bench-"))
+            pollers = await _coordinator_pollers(count, base_url, args, hass)
+        else:
+            session = aiohttp.ClientSession()
+            pollers = await _client_pollers(count, base_url, args, session)
+
+        with ResourceTimer() as timer:
+            latencies, failures = await _drive(
+                pollers, args.rounds, args.concurrency, args.interval
+            )
+    finally:
+        if session is not None:
+            await session.close()
+        if hass is not None:
+            await hass.async_stop(force=True)
+        await cloud.stop()
+
+    return {
+        "stoves": count,
+        "polls": len(latencies),
+        "failures": failures,
+        "requests": cloud.total_requests,
+        "req_per_s": cloud.total_requests / timer.wall if timer.wall else 0.0,
+        "cpu_s": timer.cpu,
+        "cpu_per_poll_ms": timer.cpu / len(latencies) * 1000 if latencies else 0.0,
+        "rss_mb": timer.peak_rss_mb,
+        **percentiles(latencies),
+    }
+
+
+async def _main() -> None:
+    args = _parse_args()
+    load_integration(with_homeassistant=args.mode == "coordinator")
+    header = (
+        f"{'stoves':>6} {'polls':>6} {'fail':>5} {'reqs':>7} {'req/s':>8} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'cpu s':>7} {'cpu/poll ms':>11} {'rss MB':>7}"
+    )
+    print(f"mode={args.mode} rounds={args.rounds} concurrency={args.concurrency} "
+          f"latency={args.latency}s jitter={args.jitter}s")
+    print(header)
+    for count in args.stoves:
+        row = await _run_size(count, args)
+        print(
+            f"{row['stoves']:>6} {row['polls']:>6} {row['failures']:>5} {row['requests']:>7} "
+            f"{row['req_per_s']:>8.1f} {ms(row['p50']):>8} {ms(row['p95']):>8} "
+            f"{ms(row['p99']):>8} {row['cpu_s']:>7.2f} {row['cpu_per_poll_ms']:>11.3f} "
+            f"{row['rss_mb']:>7.1f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
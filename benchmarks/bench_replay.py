@@ -0,0 +1,242 @@
+"""Replay captured CloudWiNet traffic through the poll path.
+
+Examples::
+
+    python benchmarks/bench_replay.py capture.jsonl                # recorded pace
+    python benchmarks/bench_replay.py capture.jsonl --speed 60     # 60x faster
+    python benchmarks/bench_replay.py a.jsonl b.jsonl --speed 0    # back to back
+    python benchmarks/bench_replay.py capture.jsonl --mode coordinator   # needs homeassistant
+
+Captures come from the ``record_traffic`` option or ``ravelli_scan.py
+--record``. Every stove found in them gets a client answered by
+``record.ReplaySession``; its polls start at the recorded ``GetStatus``
+times divided by ``--speed``, and each recorded response comes back after
+its recorded duration, also divided by ``--speed`` (``0`` removes both
+delays). The client's own clocks (rate limit, retry backoff, circuit
+cooldowns, single-flight window) are scaled by the same factor, so a faster
+replay meets the same policies the recording did. ``--speed 0`` has no time
+scale: rate limiting, single-flight and the circuit breaker are off, so
+only replays at a positive speed reproduce them. Reports poll latency, CPU
+time and peak traced allocations.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib
+import tempfile
+import time
+import tracemalloc
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from common import PACKAGE, ResourceTimer, load_integration, ms, percentiles
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("captures", nargs="+", help="capture files (JSON lines)")
+    parser.add_argument("--mode", choices=("client", "coordinator"), default="client")
+    parser.add_argument(
+        "--speed", type=float, default=1.0, help="replay speed factor, 0 = no delays"
+    )
+    parser.add_argument(
+        "--no-tracemalloc", action="store_true", help="skip allocation tracing"
+    )
+    return parser.parse_args()
+
+
+def _stove_of(entry: Dict[str, Any]) -> Tuple[str, str]:
+    """``(base_url, stove key)`` of a recorded request."""
+    prefix, _, tail = entry["url"].partition(f"/{entry['ep']}/")
+    return prefix, tail.split("/", 1)[0]
+
+
+def _schedule(entries: List[Dict[str, Any]]) -> Dict[Tuple[str, str], List[float]]:
+    """Recorded poll start times per stove.
+
+    A poll reads GetStatus once; another GetStatus sent while the previous
+    one was in flight (a hedge) or after it failed on the wire (a retry)
+    belongs to the same poll.
+    """
+    polls: Dict[Tuple[str, str], List[float]] = {}
+    previous: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for entry in sorted(entries, key=lambda entry: entry["t"]):
+        if entry["ep"] != "GetStatus":
+            continue
+        stove = _stove_of(entry)
+        last = previous.get(stove)
+        previous[stove] = entry
+        if last is not None and (
+            entry["t"] < last["t"] + last["ms"] / 1000
+            or "err" in last
+            or last["st"] != 200
+        ):
+            continue
+        polls.setdefault(stove, []).append(entry["t"])
+    return polls
+
+
+def _slow_refresh(const, speed: float) -> float:
+    # Keep the slow tier on the recorded cadence; without delays it is read
+    # on the first poll only.
+    return const.DEFAULT_SLOW_REFRESH_INTERVAL / speed if speed > 0 else float("inf")
+
+
+def _reset_request_state(speed: float) -> None:
+    """Fresh host-wide request state, its clocks scaled to the replay speed."""
+    api = importlib.import_module(f"{PACKAGE}.api")
+    const = importlib.import_module(f"{PACKAGE}.const")
+    circuit = importlib.import_module(f"{PACKAGE}.circuit")
+    hedge = importlib.import_module(f"{PACKAGE}.hedge")
+    api._HEDGE_BUDGETS = hedge.HedgeBudgetRegistry(
+        const.HEDGE_BUDGET_RATIO, const.HEDGE_BUDGET_BURST
+    )
+    if speed <= 0:
+        api.configure_rate_limits(0, const.HOST_RATE_BURST, const.HOST_POLL_MAX_DELAY)
+        api._SINGLE_FLIGHT = api._SingleFlight(0.0)
+        api._CIRCUITS = circuit.CircuitBreakerRegistry(
+            float("inf"), const.CIRCUIT_COOLDOWN, const.CIRCUIT_MAX_COOLDOWN
+        )
+        api.RETRY_BASE_DELAY = 0.0
+        return
+    api.configure_rate_limits(
+        const.HOST_RATE_LIMIT * speed,
+        const.HOST_RATE_BURST,
+        const.HOST_POLL_MAX_DELAY / speed,
+    )
+    api._SINGLE_FLIGHT = api._SingleFlight(
+        const.SINGLE_FLIGHT_WINDOW / speed
+    )
+    api._CIRCUITS = circuit.CircuitBreakerRegistry(
+        const.CIRCUIT_FAILURE_THRESHOLD,
+        const.CIRCUIT_COOLDOWN / speed,
+        const.CIRCUIT_MAX_COOLDOWN / speed,
+    )
+    api.RETRY_BASE_DELAY = const.RETRY_BASE_DELAY / speed
+
+
+def _client_pollers(stoves, session, args) -> Dict[Tuple[str, str], Callable]:
+    api = importlib.import_module(f"{PACKAGE}.api")
+    const = importlib.import_module(f"{PACKAGE}.const")
+    _reset_request_state(args.speed)
+    slow_refresh = _slow_refresh(const, args.speed)
+    return {
+        stove: api.RavelliSmartWifiClient(
+            session, stove[0], stove[1], slow_refresh_interval=slow_refresh
+        ).async_get_status
+        for stove in stoves
+    }
+
+
+def _coordinator_pollers(
+    stoves, session, args, hass
+) -> Dict[Tuple[str, str], Callable]:
+    const = importlib.import_module(f"{PACKAGE}.const")
+    coordinator_module = importlib.import_module(f"{PACKAGE}.coordinator")
+    _reset_request_state(args.speed)
+    slow_refresh = _slow_refresh(const, args.speed)
+    pollers = {}
+    for index, stove in enumerate(stoves):
+        entry = SimpleNamespace(
+            entry_id=f"replay{index:05d}",
+            title=f"Replay {stove[1][:8]}",
+            data={const.CONF_TOKEN: stove[1], const.CONF_BASE_URL: stove[0]},
+            # The coordinator applies it to the host limiter: keep it scaled
+            # (at speed 0 there is no limiter).
+            options={
+                const.CONF_HOST_RATE_LIMIT: const.HOST_RATE_LIMIT * (args.speed or 1),
+            },
+        )
+        coordinator = coordinator_module.RavelliCoordinator(hass, entry)
+        coordinator.client._session = session
+        coordinator.client._slow_refresh_interval = slow_refresh
+
+        async def _refresh(coordinator=coordinator) -> None:
+            await coordinator.async_refresh()
+            if not coordinator.last_update_success:
+                raise RuntimeError(coordinator.last_exception)
+
+        pollers[stove] = _refresh
+    return pollers
+
+
+async def _replay(
+    pollers: Dict[Tuple[str, str], Callable[[], Awaitable[Any]]],
+    schedule: Dict[Tuple[str, str], List[float]],
+    speed: float,
+) -> Tuple[List[float], int]:
+    origin = min(starts[0] for starts in schedule.values())
+    latencies: List[float] = []
+    failures = 0
+
+    async def _stove(stove: Tuple[str, str]) -> None:
+        nonlocal failures
+        began = time.perf_counter()
+        for start in schedule[stove]:
+            if speed > 0:
+                due = began + (start - origin) / speed
+                await asyncio.sleep(max(0.0, due - time.perf_counter()))
+            started = time.perf_counter()
+            try:
+                await pollers[stove]()
+            except Exception:
+                failures += 1
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(_stove(stove) for stove in schedule))
+    return latencies, failures
+
+
+async def _main() -> None:
+    args = _parse_args()
+    load_integration(with_homeassistant=args.mode == "coordinator")
+    record = importlib.import_module(f"{PACKAGE}.record")
+    entries = list(record.read_capture(args.captures))
+    schedule = _schedule(entries)
+    if not schedule:
+        raise SystemExit("no GetStatus requests in the capture")
+    session = record.ReplaySession(entries, args.speed)
+    span = max(e["t"] for e in entries) - min(e["t"] for e in entries)
+    print(
+        f"mode={args.mode} speed={args.speed} stoves={len(schedule)} "
+        f"requests={len(entries)} recorded_span={span:.0f}s"
+    )
+
+    hass = None
+    try:
+        if args.mode == "coordinator":
+            from homeassistant.core import HomeAssistant
+
+            hass = HomeAssistant(tempfile.mkdtemp(prefix="ravelli-replay-"))
+            pollers = _coordinator_pollers(schedule, session, args, hass)
+        else:
+            pollers = _client_pollers(schedule, session, args)
+        if not args.no_tracemalloc:
+            tracemalloc.start()
+        with ResourceTimer() as timer:
+            latencies, failures = await _replay(pollers, schedule, args.speed)
+        peak = tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else None
+        tracemalloc.stop()
+    finally:
+        if hass is not None:
+            await hass.async_stop(force=True)
+
+    cuts = percentiles(latencies)
+    print(
+        f"{'polls':>6} {'fail':>5} {'served':>7} {'missing':>7} {'unused':>7} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'wall s':>7} {'cpu s':>7} "
+        f"{'cpu/poll ms':>11} {'alloc MB':>8}"
+    )
+    print(
+        f"{len(latencies):>6} {failures:>5} {session.served:>7} {session.missing:>7} "
+        f"{session.remaining:>7} {ms(cuts['p50']):>8} {ms(cuts['p95']):>8} "
+        f"{ms(cuts['p99']):>8} {timer.wall:>7.2f} {timer.cpu:>7.2f} "
+        f"{timer.cpu / len(latencies) * 1000:>11.3f} "
+        f"{'-' if peak is None else f'{peak / 2**20:.2f}':>8}"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
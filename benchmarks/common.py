@@ -0,0 +1,66 @@
+"""Shared helpers for the offline benchmarks."""
+
+from __future__ import annotations
+
+import importlib.util
+import resource
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+PACKAGE = "custom_components.ravelli_smartwifi"
+PACKAGE_DIR = REPO_ROOT / "custom_components" / "ravelli_smartwifi"
+
+
+def load_integration(with_homeassistant: bool = False) -> None:
+    """Make the integration importable.
+
+    The package ``__init__`` imports Home Assistant. Client-only benchmarks
+    register bare package modules instead, so ``api.py`` and its HA-free
+    helpers load without Home Assistant installed.
+    """
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+    if with_homeassistant or PACKAGE in sys.modules:
+        return
+    for name, path in (
+        ("custom_components", PACKAGE_DIR.parent),
+        (PACKAGE, PACKAGE_DIR),
+    ):
+        if name in sys.modules:
+            continue
+        spec = importlib.util.spec_from_loader(name, loader=None, is_package=True)
+        module = importlib.util.module_from_spec(spec)
+        module.__path__ = [str(path)]
+        sys.modules[name] = module
+
+
+def percentiles(samples: List[float]) -> Dict[str, float | None]:
+    if len(samples) < 2:
+        value = samples[0] if samples else None
+        return {"p50": value, "p95": value, "p99": value}
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"p50": cuts[49], "p95": cuts[94], "p99": cuts[98]}
+
+
+class ResourceTimer:
+    """Measure wall time, CPU time and peak RSS around a block."""
+
+    def __enter__(self) -> "ResourceTimer":
+        self._wall = time.perf_counter()
+        self._cpu = time.process_time()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.wall = time.perf_counter() - self._wall
+        self.cpu = time.process_time() - self._cpu
+        # ru_maxrss is in KiB on Linux and bytes on macOS.
+        scale = 1 if sys.platform == "darwin" else 1024
+        self.peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / 2**20
+
+
+def ms(value: float | None) -> str:
+    return "-" if value is None else f"{value * 1000:.1f}"
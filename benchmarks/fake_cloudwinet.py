@@ -0,0 +1,151 @@
+"""In-process stand-in for the CloudWiNet ``WiNetStove.svc/json`` API.
+
+Serves GetStatus, GetPower, GetTemperature, GetActualTemperature, SetPower,
+SetTemperature, Ignit and Shutdown for any token, keeping one simulated stove
+per token. Latency, jitter and error injection are configurable so the
+benchmarks can reproduce a slow or flaky cloud.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Dict
+
+from aiohttp import web
+
+SERVICE_PATH = "/WiNetStove.svc/json"
+
+STATUS_TEXT = {0: "OFF", 1: "IGNITION", 4: "WORK", 6: "FINAL CLEANING"}
+
+
+@dataclass
+class FakeStove:
+    status: int = 0
+    power: int = 3
+    set_temp: int = 21
+    ambient_temp: float = 19.0
+    changed_at: float = field(default_factory=time.monotonic)
+
+    def advance(self, ignition_time: float, cleaning_time: float) -> None:
+        elapsed = time.monotonic() - self.changed_at
+        if self.status == 1 and elapsed >= ignition_time:
+            self.set_status(4)
+        elif self.status == 6 and elapsed >= cleaning_time:
+            self.set_status(0)
+        drift = 0.05 if self.status == 4 else -0.02
+        self.ambient_temp = round(self.ambient_temp + drift + random.uniform(-0.05, 0.05), 1)
+
+    def set_status(self, status: int) -> None:
+        self.status = status
+        self.changed_at = time.monotonic()
+
+
+@dataclass
+class FakeCloudConfig:
+    latency: float = 0.05
+    jitter: float = 0.02
+    # Share of requests delayed by an extra ``tail_latency`` (long tail).
+    tail_rate: float = 0.0
+    tail_latency: float = 1.0
+    error_rate: float = 0.0
+    http_error_rate: float = 0.0
+    invalid_json_rate: float = 0.0
+    ignition_time: float = 5.0
+    cleaning_time: float = 5.0
+
+
+class FakeCloudWiNet:
+    """aiohttp application emulating CloudWiNet, one ``FakeStove`` per token."""
+
+    def __init__(self, config: FakeCloudConfig | None = None) -> None:
+        self.config = config or FakeCloudConfig()
+        self.stoves: Dict[str, FakeStove] = {}
+        self.requests: Dict[str, int] = {}
+        self._runner: web.AppRunner | None = None
+        self.base_url = ""
+        self.app = web.Application()
+        self.app.router.add_get(SERVICE_PATH + "/{endpoint}/{arg}", self._handle)
+
+    @property
+    def total_requests(self) -> int:
+        return sum(self.requests.values())
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        bound_port = self._runner.addresses[0][1]
+        self.base_url = f"http://{host}:{bound_port}{SERVICE_PATH}"
+        return self.base_url
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        endpoint = request.match_info["endpoint"]
+        token, _, value = request.match_info["arg"].partition(";")
+        self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+
+        cfg = self.config
+        delay = max(0.0, cfg.latency + random.uniform(-cfg.jitter, cfg.jitter))
+        if random.random() < cfg.tail_rate:
+            delay += cfg.tail_latency
+        if delay:
+            await asyncio.sleep(delay)
+        roll = random.random()
+        if roll < cfg.http_error_rate:
+            return web.Response(status=503, text="Service Unavailable")
+        roll -= cfg.http_error_rate
+        if roll < cfg.invalid_json_rate:
+            return web.Response(text="<html>gateway error</html>")
+        roll -= cfg.invalid_json_rate
+        if roll < cfg.error_rate:
+            return self._json(
+                {"Success": False, "Error": "E01", "ErrorDescription": "Stove not reachable"}
+            )
+
+        stove = self.stoves.setdefault(token, FakeStove())
+        stove.advance(cfg.ignition_time, cfg.cleaning_time)
+        return self._json(self._dispatch(stove, endpoint, value))
+
+    @staticmethod
+    def _dispatch(stove: FakeStove, endpoint: str, value: str) -> dict:
+        ok = {"Success": True, "Error": None, "ErrorDescription": None}
+        if endpoint == "GetStatus":
+            return {
+                **ok,
+                "Status": stove.status,
+                "StatusDescription": STATUS_TEXT.get(stove.status, "UNKNOWN"),
+            }
+        if endpoint == "GetPower":
+            return {**ok, "Result": stove.power}
+        if endpoint == "GetTemperature":
+            return {**ok, "Result": stove.set_temp}
+        if endpoint == "GetActualTemperature":
+            return {**ok, "Result": stove.ambient_temp}
+        if endpoint == "SetPower" and value.isdigit():
+            stove.power = int(value)
+            return ok
+        if endpoint == "SetTemperature" and value.isdigit():
+            stove.set_temp = int(value)
+            return ok
+        if endpoint == "Ignit":
+            if stove.status in (0, 6):
+                stove.set_status(1)
+            return ok
+        if endpoint == "Shutdown":
+            if stove.status not in (0, 6):
+                stove.set_status(6)
+            return ok
+        return {"Success": False, "Error": "E99", "ErrorDescription": f"Unknown call {endpoint}"}
+
+    @staticmethod
+    def _json(payload: dict) -> web.Response:
+        return web.Response(text=json.dumps(payload), content_type="application/json")
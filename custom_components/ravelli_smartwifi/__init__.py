@@ -2,15 +2,79 @@ from __future__ import annotations
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers import device_registry as dr
 
-from .const import DOMAIN, PLATFORMS
+from .const import (
+    DATA_FLEET,
+    DATA_PROBES,
+    DOMAIN,
+    PLATFORMS,
+    PROBE_REUSE_WINDOW,
+    RELAY_SETUP_TIMEOUT,
+)
 from .coordinator import RavelliCoordinator
+from .fleet import RavelliFleetPoller
+from .storage import RavelliStore
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    coordinator = RavelliCoordinator(hass, entry)
-    await coordinator.async_config_entry_first_refresh()
-    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    fleet = domain_data.get(DATA_FLEET)
+    if fleet is None:
+        fleet = domain_data[DATA_FLEET] = RavelliFleetPoller(hass)
+
+    store = RavelliStore(hass, entry.entry_id)
+    await store.async_load()
+    coordinator = RavelliCoordinator(hass, entry, fleet, store)
+    initial = store.snapshot
+    just_polled = False
+    probe = domain_data.get(DATA_PROBES, {}).pop(coordinator.token, None)
+    if probe is not None:
+        # Entry just created: reuse the status the config flow read, so the
+        # first poll only fetches the remaining fields.
+        coordinator.client.seed_fields(probe, PROBE_REUSE_WINDOW)
+        initial = coordinator.client.cached_state(("power", "set_temp", "ambient_temp"))
+    if coordinator.is_relay_subscriber:
+        # Another instance polls this stove; its retained snapshot arrives as
+        # soon as the relay subscribes.
+        if initial is not None:
+            coordinator.async_restore(initial)
+        try:
+            await coordinator.relay.async_start()
+            if (
+                not await coordinator.relay.async_wait_for_state(RELAY_SETUP_TIMEOUT)
+                and initial is None
+            ):
+                raise ConfigEntryNotReady("No snapshot from the relay publisher yet")
+        except Exception:
+            await coordinator.async_shutdown()
+            raise
+    elif initial is not None:
+        # Entities come up with the last known (stale) values right away; the
+        # first live poll happens in the background on the fleet schedule.
+        coordinator.async_restore(initial)
+        if coordinator.pool is not None:
+            entry.async_create_background_task(
+                hass, coordinator.pool.async_warm_up(), "ravelli_smartwifi warm-up"
+            )
+    else:
+        if coordinator.pool is not None:
+            await coordinator.pool.async_warm_up()
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except Exception:
+            await coordinator.async_shutdown()
+            raise
+        just_polled = True
+    if coordinator.relay is not None and not coordinator.is_relay_subscriber:
+        try:
+            await coordinator.relay.async_start()
+        except Exception:
+            await coordinator.async_shutdown()
+            raise
+    domain_data[entry.entry_id] = coordinator
+    if not coordinator.is_relay_subscriber:
+        fleet.async_register(coordinator, just_polled)
 
     device_registry = dr.async_get(hass)
     device_registry.async_get_or_create(
@@ -28,5 +92,18 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id, None)
+        domain_data = hass.data[DOMAIN]
+        coordinator: RavelliCoordinator | None = domain_data.pop(entry.entry_id, None)
+        # Stop the fleet's timer first: a poll must not run on the closed session.
+        fleet: RavelliFleetPoller | None = domain_data.get(DATA_FLEET)
+        if fleet is not None:
+            fleet.async_unregister(entry.entry_id)
+            if not fleet.entry_ids:
+                await fleet.async_shutdown()
+                domain_data.pop(DATA_FLEET, None)
+        if coordinator is not None:
+            await coordinator.async_shutdown()
     return unload_ok
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    await RavelliStore(hass, entry.entry_id).async_remove()
@@ -1,24 +1,172 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
-from typing import Any, Dict
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Tuple
 from urllib.parse import quote
 
 import aiohttp
 
+from . import codec
+from .circuit import CircuitBreakerRegistry
+from .const import (
+    CIRCUIT_COOLDOWN,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_MAX_COOLDOWN,
+    DEFAULT_POLL_BUDGET,
+    DEFAULT_SLOW_REFRESH_INTERVAL,
+    HEDGE_BUDGET_BURST,
+    HEDGE_BUDGET_RATIO,
+    HEDGE_MIN_DELAY,
+    HEDGE_MIN_SAMPLES,
+    HEDGE_QUANTILE,
+    HOST_POLL_MAX_DELAY,
+    HOST_RATE_BURST,
+    HOST_RATE_LIMIT,
+    PROBE_TIMEOUT,
+    REQUEST_TIMEOUT,
+    RETRY_ATTEMPTS,
+    RETRY_BASE_DELAY,
+    SINGLE_FLIGHT_WINDOW,
+)
+from .errors import (
+    RavelliApiError,
+    RavelliCircuitOpenError,
+    RavelliHttpError,
+    RavelliInvalidResponseError,
+    RavelliPollError,
+    RavelliRateLimitedError,
+    RavelliTransportError,
+    RavelliUnsuccessfulError,
+)
+from .hedge import HedgeBudgetRegistry
+from .metrics import (
+    ERROR_HTTP,
+    ERROR_JSON,
+    ERROR_TRANSPORT,
+    ERROR_UNSUCCESSFUL,
+    ClientMetrics,
+)
+from .ratelimit import (
+    PRIORITY_COMMAND,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_POLL,
+    RateLimiterRegistry,
+)
+from .record import TrafficRecorder, stove_key
+from .state import StoveState, derive_is_on
+
 _LOGGER = logging.getLogger(__name__)
 
+# Snapshot field -> endpoint returning it as a plain ``Result``.
+_RESULT_FIELDS = {
+    "power": "GetPower",
+    "set_temp": "GetTemperature",
+    "ambient_temp": "GetActualTemperature",
+}
+# Fields that only change when somebody writes them. They are re-read on the
+# slow cadence, or as soon as one of our own commands marks them stale.
+SLOW_FIELDS = frozenset({"power", "set_temp"})
+# Everything a poll reads, "status" being the whole GetStatus block.
+_POLLED_FIELDS = ("status", *_RESULT_FIELDS)
+# Commands that are not safe to send twice when the first attempt's outcome
+# is unknown.
+_NO_RETRY = frozenset({"Ignit", "Shutdown"})
+
+
+class _SingleFlight:
+    """Share one in-flight read per URL and briefly reuse its result.
+
+    The URL embeds the token, so every client instance talking to the same
+    stove (coordinator, config flow, command confirmations) shares reads.
+    """
+
+    def __init__(self, window: float) -> None:
+        self._window = window
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._recent: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+    async def run(
+        self, key: str, fetch: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        recent = self._recent.get(key)
+        if recent is not None:
+            if time.monotonic() - recent[0] < self._window:
+                return recent[1]
+            del self._recent[key]
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+        # Shielded so one caller giving up does not cancel the others' read.
+        return await asyncio.shield(task)
+
+    def _finished(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+            if not task.cancelled() and task.exception() is None:
+                self._recent[key] = (time.monotonic(), task.result())
+
+    def forget(self, key: str) -> None:
+        self._inflight.pop(key, None)
+        self._recent.pop(key, None)
+
+
+_SINGLE_FLIGHT = _SingleFlight(SINGLE_FLIGHT_WINDOW)
+_RATE_LIMITS = RateLimiterRegistry(HOST_RATE_LIMIT, HOST_RATE_BURST, HOST_POLL_MAX_DELAY)
+_CIRCUITS = CircuitBreakerRegistry(
+    CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_COOLDOWN, CIRCUIT_MAX_COOLDOWN
+)
+_HEDGE_BUDGETS = HedgeBudgetRegistry(HEDGE_BUDGET_RATIO, HEDGE_BUDGET_BURST)
+
+
+def configure_rate_limits(rate: float, burst: int, max_poll_delay: float) -> None:
+    """Replace the host-wide rate limits for clients created from now on.
+
+    For standalone tools; inside Home Assistant the defaults from ``const``
+    apply. A non-positive ``rate`` disables rate limiting.
+    """
+    global _RATE_LIMITS
+    _RATE_LIMITS = RateLimiterRegistry(rate, burst, max_poll_delay)
+
 
 class RavelliSmartWifiClient:
     """Client for the CloudWiNet (Ravelli Smart Wi‑Fi) JSON API."""
 
-    def __init__(self, session: aiohttp.ClientSession, base_url: str, token: str, debug: bool = False) -> None:
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        base_url: str,
+        token: str,
+        debug: bool = False,
+        slow_refresh_interval: float = DEFAULT_SLOW_REFRESH_INTERVAL,
+        poll_budget: float = DEFAULT_POLL_BUDGET,
+        hedged_reads: bool = False,
+        recorder: TrafficRecorder | None = None,
+        rate_limit: float | None = None,
+        rate_burst: int | None = None,
+    ) -> None:
         self._session = session
         self._base = base_url.rstrip("/")
+        self.rate_limiter = _RATE_LIMITS.get(self._base, rate_limit, rate_burst)
+        self.circuit = _CIRCUITS.get(self._base)
+        self.hedge_budget = _HEDGE_BUDGETS.get(self._base) if hedged_reads else None
         self._token = token
         self._debug = debug
+        self._slow_refresh_interval = slow_refresh_interval
+        self._poll_budget = poll_budget
+        self.metrics = ClientMetrics()
+        self.recorder = recorder
+        # Last known value of each field ("status" holds the GetStatus payload)
+        # with the monotonic time it was read, and fields our writes made stale.
+        self._fields: Dict[str, Tuple[Any, float]] = {}
+        self._stale: set[str] = set()
+        # Fields seeded from another client, not re-read until this time.
+        self._fresh_until: Dict[str, float] = {}
 
     def _url(self, endpoint: str, *extra: str, suffix: str = "") -> str:
         parts = [self._base, endpoint, quote(self._token, safe="")]
@@ -34,71 +182,392 @@ class RavelliSmartWifiClient:
         prefix = self._token[:4]
         return value.replace(self._token, f"{prefix}***")
 
-    async def _request(self, endpoint: str, *extra: str, suffix: str = "") -> Dict[str, Any]:
+    async def _request(
+        self,
+        endpoint: str,
+        *extra: str,
+        suffix: str = "",
+        timeout: float = REQUEST_TIMEOUT,
+        priority: int = PRIORITY_INTERACTIVE,
+    ) -> Dict[str, Any]:
         url = self._url(endpoint, *extra, suffix=suffix)
-        _LOGGER.debug("GET %s", self._redact(url))
-        async with self._session.get(url, timeout=30) as resp:
-            text = await resp.text()
-            if resp.status != 200:
-                raise RuntimeError(f"{endpoint} failed: HTTP {resp.status} {text}")
-            if self._debug:
-                _LOGGER.debug("%s response: %s", endpoint, text)
+        if endpoint.startswith("Get"):
+            return await _SINGLE_FLIGHT.run(
+                url, lambda: self._fetch(endpoint, url, timeout, priority)
+            )
+        return await self._fetch(endpoint, url, timeout, PRIORITY_COMMAND)
+
+    async def _fetch(
+        self,
+        endpoint: str,
+        url: str,
+        timeout: float,
+        priority: int,
+        retry: bool = True,
+    ) -> Dict[str, Any]:
+        """Send one request, retrying retryable failures with jittered backoff.
+
+        The circuit breaker sees the request once, with its final outcome:
+        retries of a request count as a single failure. ``retry=False``
+        sends exactly one request, neither retried nor hedged.
+        """
+        self.circuit.before_request()
+        try:
+            if retry:
+                data = await self._fetch_with_retries(endpoint, url, timeout, priority)
+            else:
+                data = await self._attempt(endpoint, url, timeout, priority)
+        except RavelliApiError as err:
+            if isinstance(err, RavelliRateLimitedError):
+                self.circuit.release()
+            elif err.retryable:
+                self.circuit.record_failure()
+            else:
+                # The host answered; a 4xx is not an outage.
+                self.circuit.record_success()
+            raise
+        except BaseException:
+            self.circuit.release()
+            raise
+        self.circuit.record_success()
+        return data
+
+    async def _fetch_with_retries(
+        self, endpoint: str, url: str, timeout: float, priority: int
+    ) -> Dict[str, Any]:
+        retries = 0 if endpoint in _NO_RETRY else RETRY_ATTEMPTS
+        send = self._attempt
+        if self.hedge_budget is not None and endpoint.startswith("Get"):
+            send = self._hedged_attempt
+        attempt = 0
+        while True:
             try:
-                data = json.loads(text)
-            except json.JSONDecodeError as err:
-                raise RuntimeError(f"{endpoint} returned invalid JSON: {text}") from err
-            return data
-
-    @staticmethod
-    def _ensure_success(endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
-        if not payload.get("Success", False):
-            raise RuntimeError(
+                return await send(endpoint, url, timeout, priority)
+            except RavelliApiError as err:
+                if not err.retryable or attempt >= retries:
+                    raise
+                attempt += 1
+                # Full jitter keeps stoves that failed together from retrying
+                # together.
+                delay = random.uniform(0, RETRY_BASE_DELAY * 2**attempt)
+                self.metrics.retries += 1
+                _LOGGER.debug(
+                    "%s failed (%s), retry %d in %.2fs", endpoint, err, attempt, delay
+                )
+            await asyncio.sleep(delay)
+
+    def _hedge_delay(self, endpoint: str) -> float | None:
+        latency = self.hedge_budget.latency(endpoint)
+        if latency is None or latency.count < HEDGE_MIN_SAMPLES:
+            return None
+        return max(latency.quantile(HEDGE_QUANTILE), HEDGE_MIN_DELAY)
+
+    async def _hedged_attempt(
+        self, endpoint: str, url: str, timeout: float, priority: int
+    ) -> Dict[str, Any]:
+        """Send a read, and a duplicate if it outlives the endpoint's p90.
+
+        The first successful response wins and the other one is cancelled;
+        the read only fails if both copies do.
+        """
+        self.hedge_budget.earn()
+        delay = self._hedge_delay(endpoint)
+        tasks = [asyncio.ensure_future(self._attempt(endpoint, url, timeout, priority))]
+        try:
+            if delay is not None:
+                await asyncio.wait(tasks, timeout=delay)
+            if delay is None or tasks[0].done() or not self.hedge_budget.try_spend():
+                return await tasks[0]
+            self.metrics.hedges += 1
+            tasks.append(
+                asyncio.ensure_future(self._attempt(endpoint, url, timeout, priority))
+            )
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is tasks[1]:
+                            self.metrics.hedge_wins += 1
+                        return task.result()
+            # Both copies failed: report the original read's error.
+            return tasks[0].result()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _attempt(
+        self, endpoint: str, url: str, timeout: float, priority: int
+    ) -> Dict[str, Any]:
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire(priority)
+        return await self._send(endpoint, url, timeout)
+
+    def _capture(
+        self,
+        endpoint: str,
+        url: str,
+        started: float,
+        elapsed: float,
+        status: int | None = None,
+        body: bytes = b"",
+        error: str | None = None,
+    ) -> None:
+        """Hand one exchange to the recorder, the token replaced by its key."""
+        if self._token:
+            key = stove_key(self._token)
+            url = url.replace(quote(self._token, safe=""), key)
+            body = body.replace(self._token.encode(), key.encode())
+        self.recorder.record(endpoint, url, started, elapsed, status, body, error)
+
+    async def _send(self, endpoint: str, url: str, timeout: float) -> Dict[str, Any]:
+        _LOGGER.debug("GET %s", self._redact(url))
+        started_at = time.time()
+        started = time.monotonic()
+        try:
+            async with self._session.get(url, timeout=timeout) as resp:
+                body = await resp.read()
+                status = resp.status
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            self.metrics.record_error(endpoint, ERROR_TRANSPORT)
+            if self.recorder is not None:
+                self._capture(
+                    endpoint,
+                    url,
+                    started_at,
+                    time.monotonic() - started,
+                    error=err.__class__.__name__,
+                )
+            raise RavelliTransportError(
+                f"{endpoint} failed: {err.__class__.__name__} {err}"
+            ) from err
+        elapsed = time.monotonic() - started
+        self.metrics.record_request(endpoint, elapsed, len(body))
+        if self.hedge_budget is not None:
+            self.hedge_budget.observe(endpoint, elapsed)
+        if self.recorder is not None:
+            self._capture(endpoint, url, started_at, elapsed, status, body)
+
+        if status != 200:
+            self.metrics.record_error(endpoint, ERROR_HTTP)
+            raise RavelliHttpError(
+                f"{endpoint} failed: HTTP {status} {codec.excerpt(body)}", status
+            )
+        if self._debug:
+            _LOGGER.debug("%s response: %s", endpoint, body.decode("utf-8", "replace"))
+        try:
+            return codec.decode(body)
+        except codec.DecodeError as err:
+            self.metrics.record_error(endpoint, ERROR_JSON)
+            raise RavelliInvalidResponseError(
+                f"{endpoint} returned invalid JSON ({err}): {codec.excerpt(body)}"
+            ) from err
+
+    def _ensure_success(self, endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if not codec.is_success(payload):
+            self.metrics.record_error(endpoint, ERROR_UNSUCCESSFUL)
+            raise RavelliUnsuccessfulError(
                 f"{endpoint} failed: {payload.get('Error')} {payload.get('ErrorDescription')}"
             )
         return payload
 
-    async def _call_result(self, endpoint: str, *extra: str) -> float:
-        data = self._ensure_success(endpoint, await self._request(endpoint, *extra))
-        if "Result" not in data:
-            raise RuntimeError(f"{endpoint} response missing 'Result': {data}")
-        return data["Result"]
+    async def _call_result(
+        self, endpoint: str, priority: int = PRIORITY_INTERACTIVE
+    ) -> float:
+        data = self._ensure_success(
+            endpoint, await self._request(endpoint, priority=priority)
+        )
+        try:
+            return codec.result(data)
+        except codec.DecodeError as err:
+            raise RavelliInvalidResponseError(f"{endpoint} response: {err}") from err
+
+    async def _call_status(
+        self, timeout: float = REQUEST_TIMEOUT, priority: int = PRIORITY_INTERACTIVE
+    ) -> Dict[str, Any]:
+        return self._ensure_success(
+            "GetStatus",
+            await self._request("GetStatus", timeout=timeout, priority=priority),
+        )
+
+    def _call_field(self, field: str, priority: int) -> Awaitable[Any]:
+        if field == "status":
+            return self._call_status(priority=priority)
+        return self._call_result(_RESULT_FIELDS[field], priority)
 
-    async def _call_status(self) -> Dict[str, Any]:
-        return self._ensure_success("GetStatus", await self._request("GetStatus"))
+    def invalidate(self, *fields: str) -> None:
+        """Force the given snapshot fields to be re-read on the next poll."""
+        for field in fields:
+            self._stale.add(field)
+            endpoint = "GetStatus" if field == "status" else _RESULT_FIELDS[field]
+            _SINGLE_FLIGHT.forget(self._url(endpoint))
+
+    def _field_due(self, field: str, now: float) -> bool:
+        if field in self._stale:
+            return True
+        if now < self._fresh_until.get(field, 0.0):
+            return False
+        if field not in SLOW_FIELDS:
+            return True
+        cached = self._fields.get(field)
+        return cached is None or now - cached[1] >= self._slow_refresh_interval
 
-    async def async_get_status(self) -> Dict[str, Any]:
-        status_task = self._call_status()
-        power_task = self._call_result("GetPower")
-        set_temp_task = self._call_result("GetTemperature")
-        ambient_temp_task = self._call_result("GetActualTemperature")
+    async def async_get_status(self) -> StoveState:
+        """Poll the stove within the poll budget.
 
-        status_data, power, set_temp, ambient_temp = await asyncio.gather(
-            status_task, power_task, set_temp_task, ambient_temp_task
+        Fields that do not arrive in time, or fail, keep their last known
+        value and are listed in ``stale_fields``; ``updated_at`` carries the
+        wall-clock time each field was last read, ``stale_since`` when the
+        oldest stale one was read. A poll that refreshes nothing (e.g. while the
+        circuit is open) still returns the last known values; the
+        coordinator bounds how long they are served. Only a poll that cannot
+        produce any status at all raises.
+        """
+        now = time.monotonic()
+        tasks = {
+            field: asyncio.ensure_future(self._call_field(field, PRIORITY_POLL))
+            for field in _POLLED_FIELDS
+            if self._field_due(field, now)
+        }
+        late: set = set()
+        if tasks:
+            _, late = await asyncio.wait(tasks.values(), timeout=self._poll_budget)
+        for task in late:
+            task.cancel()
+        self.metrics.polls.add(time.monotonic() - now)
+
+        stale_fields = []
+        errors = []
+        failures: List[BaseException | None] = []
+        for field, task in tasks.items():
+            if task in late:
+                stale_fields.append(field)
+                errors.append(f"{field} timed out")
+                failures.append(None)
+            elif (err := task.exception()) is not None:
+                stale_fields.append(field)
+                errors.append(str(err))
+                failures.append(err)
+            else:
+                self._fields[field] = (task.result(), now)
+                self._stale.discard(field)
+        if "status" not in self._fields:
+            if failures and all(
+                isinstance(err, RavelliCircuitOpenError) for err in failures
+            ):
+                raise RavelliCircuitOpenError(errors[0])
+            raise RavelliPollError("; ".join(errors))
+        if stale_fields:
+            _LOGGER.debug(
+                "Partial poll for stove %s, keeping last known %s: %s",
+                self._token[:4],
+                ", ".join(stale_fields),
+                "; ".join(errors),
+            )
+
+        state = self.cached_state(stale_fields)
+        if self._debug:
+            _LOGGER.debug("Aggregated status: %s", state)
+        return state
+
+    def cached_state(self, stale_fields: Iterable[str] = ()) -> StoveState:
+        """Build a snapshot from the last known value of every field."""
+        wall_offset = time.time() - time.monotonic()
+        summary = self._status_summary(self._fields["status"][0])
+        updated_at = {"status": self._fields["status"][1] + wall_offset}
+        for field in _RESULT_FIELDS:
+            cached = self._fields.get(field)
+            summary[field] = cached[0] if cached is not None else None
+            updated_at[field] = cached[1] + wall_offset if cached is not None else None
+        return StoveState(
+            **summary, updated_at=updated_at, stale_fields=tuple(stale_fields)
         )
 
+    async def async_probe(self, timeout: float = PROBE_TIMEOUT) -> StoveState:
+        """Validate the token with a single, short GetStatus.
+
+        One attempt, without retries or the single-flight cache, and bounded
+        by ``timeout`` as a whole (rate-limiter wait included). The snapshot
+        only carries the status block; the other fields are listed as stale
+        until a full poll reads them.
+        """
+        url = self._url("GetStatus")
+        try:
+            payload = await asyncio.wait_for(
+                self._fetch("GetStatus", url, timeout, PRIORITY_INTERACTIVE, False),
+                timeout,
+            )
+        except asyncio.TimeoutError as err:
+            raise RavelliTransportError(
+                f"GetStatus failed: no answer within {timeout}s"
+            ) from err
+        self._fields["status"] = (
+            self._ensure_success("GetStatus", payload),
+            time.monotonic(),
+        )
+        return self.cached_state(
+            [field for field in _RESULT_FIELDS if field not in self._fields]
+        )
+
+    def cached_fields(self) -> Dict[str, Tuple[Any, float]]:
+        """Return the raw field cache, for handing over to another client."""
+        return dict(self._fields)
+
+    def seed_fields(
+        self, fields: Dict[str, Tuple[Any, float]], fresh_for: float
+    ) -> None:
+        """Adopt fields read by another client and skip re-reading them for
+        ``fresh_for`` seconds after they were read."""
+        for field, (value, read_at) in fields.items():
+            if field in self._fields and self._fields[field][1] >= read_at:
+                continue
+            self._fields[field] = (value, read_at)
+            self._fresh_until[field] = read_at + fresh_for
+
+    async def async_read(self, *fields: str) -> Dict[str, Any]:
+        """Read only the given snapshot fields.
+
+        ``"status"`` stands for the whole GetStatus block (status code and
+        text, error fields and ``is_on``); any other name is a Result field.
+        """
+        now = time.monotonic()
+        names = [field for field in fields if field in _RESULT_FIELDS]
+        calls = [self._call_result(_RESULT_FIELDS[field]) for field in names]
+        if "status" in fields:
+            calls.append(self._call_status())
+        results = await asyncio.gather(*calls)
+
+        partial: Dict[str, Any] = {}
+        for field, value in zip(names, results):
+            self._fields[field] = (value, now)
+            self._stale.discard(field)
+            partial[field] = value
+        if "status" in fields:
+            self._fields["status"] = (results[-1], now)
+            self._stale.discard("status")
+            partial.update(self._status_summary(results[-1]))
+        return partial
+
+    def _status_summary(self, status_data: Dict[str, Any]) -> Dict[str, Any]:
         status_code = status_data.get("Status")
         status_text = status_data.get("StatusDescription")
-        is_on = self._derive_is_on(status_code, status_text)
-
-        summary = {
+        return {
             "status_code": status_code,
             "status": status_text,
             "error": status_data.get("Error"),
             "error_description": status_data.get("ErrorDescription"),
-            "power": power,
-            "set_temp": set_temp,
-            "ambient_temp": ambient_temp,
-            "is_on": is_on,
+            "is_on": derive_is_on(status_code, status_text),
         }
-        if self._debug:
-            _LOGGER.debug("Aggregated status: %s", summary)
-        return summary
 
     async def async_turn_on(self) -> None:
         self._ensure_success("Ignit", await self._request("Ignit"))
+        self.invalidate("status")
 
     async def async_turn_off(self) -> None:
         self._ensure_success("Shutdown", await self._request("Shutdown"))
+        self.invalidate("status")
 
     async def async_set_temperature(self, temperature: float) -> None:
         target = int(round(float(temperature)))
@@ -106,6 +575,7 @@ class RavelliSmartWifiClient:
             "SetTemperature",
             await self._request("SetTemperature", suffix=f";{target}"),
         )
+        self.invalidate("set_temp")
 
     async def async_set_power(self, power: int) -> None:
         level = int(power)
@@ -113,16 +583,4 @@ class RavelliSmartWifiClient:
             "SetPower",
             await self._request("SetPower", suffix=f";{level}"),
         )
-
-    @staticmethod
-    def _derive_is_on(status_code: int | None, status_text: str | None) -> bool:
-        """Return True when the stove is actively heating or igniting."""
-        if status_code in (None, 0):
-            return False
-        if status_code == 6:
-            return False
-        if status_text and status_code is None:
-            normalized = status_text.upper()
-            if any(keyword in normalized for keyword in ("CLEANING", "OFF", "STOP")):
-                return False
-        return True
+        self.invalidate("power")
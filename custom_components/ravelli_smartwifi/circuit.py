@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import logging
+import random
+import time
+from typing import Any, Dict
+from urllib.parse import urlsplit
+
+from .errors import RavelliCircuitOpenError
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stop sending requests to a host that keeps failing.
+
+    ``threshold`` consecutive retryable failures open the circuit: requests
+    then fail fast with ``RavelliCircuitOpenError`` until the (jittered)
+    cooldown has passed. The next request is let through as a probe; its
+    success closes the circuit, its failure reopens it with the cooldown
+    doubled up to ``max_cooldown``.
+    """
+
+    def __init__(
+        self, host: str, threshold: int, cooldown: float, max_cooldown: float
+    ) -> None:
+        self._host = host
+        self._threshold = threshold
+        self._base_cooldown = cooldown
+        self._max_cooldown = max_cooldown
+        self._cooldown = cooldown
+        self._failures = 0
+        self._retry_at = 0.0
+        self._probing = False
+        self.state = STATE_CLOSED
+        self.opened = 0
+        self.rejected = 0
+
+    @property
+    def is_open(self) -> bool:
+        return self.state != STATE_CLOSED
+
+    @property
+    def retry_in(self) -> float:
+        """Seconds until a probe request is allowed (0 when closed)."""
+        if self.state == STATE_CLOSED:
+            return 0.0
+        return max(0.0, self._retry_at - time.monotonic())
+
+    def before_request(self) -> None:
+        if self.state == STATE_CLOSED:
+            return
+        if self._probing or time.monotonic() < self._retry_at:
+            self.rejected += 1
+            raise RavelliCircuitOpenError(
+                f"{self._host} unavailable, next attempt in {self.retry_in:.0f}s"
+            )
+        self.state = STATE_HALF_OPEN
+        self._probing = True
+
+    def release(self) -> None:
+        """Forget a request that ended without a verdict (cancelled, shed)."""
+        self._probing = False
+
+    def record_success(self) -> None:
+        if self.state != STATE_CLOSED:
+            _LOGGER.info("%s is reachable again, resuming requests", self._host)
+        self.state = STATE_CLOSED
+        self._failures = 0
+        self._cooldown = self._base_cooldown
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self._probing = False
+        if self.state != STATE_CLOSED:
+            self._cooldown = min(self._cooldown * 2, self._max_cooldown)
+            self._open()
+            return
+        self._failures += 1
+        if self._failures >= self._threshold:
+            self._open()
+
+    def _open(self) -> None:
+        # Jittered so stoves sharing the host do not all probe at once.
+        delay = self._cooldown * random.uniform(0.8, 1.2)
+        self._retry_at = time.monotonic() + delay
+        if self.state == STATE_CLOSED:
+            self.opened += 1
+            _LOGGER.warning(
+                "%s failed %d requests in a row, pausing requests for %.0fs",
+                self._host,
+                self._failures,
+                delay,
+            )
+        self.state = STATE_OPEN
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "retry_in": round(self.retry_in, 1),
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
+
+
+class CircuitBreakerRegistry:
+    """One ``CircuitBreaker`` per host."""
+
+    def __init__(self, threshold: int, cooldown: float, max_cooldown: float) -> None:
+        self._threshold = threshold
+        self._cooldown = cooldown
+        self._max_cooldown = max_cooldown
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, base_url: str) -> CircuitBreaker:
+        host = urlsplit(base_url).netloc.lower()
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = self._breakers[host] = CircuitBreaker(
+                host, self._threshold, self._cooldown, self._max_cooldown
+            )
+        return breaker
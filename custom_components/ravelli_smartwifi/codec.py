@@ -0,0 +1,65 @@
+"""Decode CloudWiNet response bodies.
+
+orjson is used when installed (Home Assistant ships it) and parses the
+bytes directly. The standard library fallback decodes them to text first:
+``json.loads`` on bytes sniffs the encoding and is slower than an explicit
+UTF-8 decode followed by parsing the text.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Callable, Dict
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+if orjson is not None:
+    BACKEND = "orjson"
+    _loads: Callable[[bytes], Any] = orjson.loads
+else:
+    BACKEND = "json"
+
+    def _loads(body: bytes) -> Any:
+        return json.loads(body.decode("utf-8"))
+
+
+# Longest body excerpt quoted in an error message.
+_EXCERPT_LIMIT = 256
+
+
+class DecodeError(ValueError):
+    """The body is not a JSON object, or lacks a field the endpoint returns."""
+
+
+def decode(body: bytes) -> Dict[str, Any]:
+    try:
+        payload = _loads(body)
+    except ValueError as err:  # incl. UnicodeDecodeError and orjson's errors
+        raise DecodeError(str(err)) from err
+    if type(payload) is not dict:
+        raise DecodeError(f"expected a JSON object, got {type(payload).__name__}")
+    return payload
+
+
+def is_success(payload: Dict[str, Any]) -> bool:
+    return bool(payload.get("Success"))
+
+
+def result(payload: Dict[str, Any]) -> float:
+    """Return the numeric ``Result`` of a GetPower/GetTemperature-style reply."""
+    value = payload.get("Result")
+    if type(value) in (int, float):
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise DecodeError(f"missing or non-numeric 'Result': {value!r}") from None
+
+
+def excerpt(body: bytes) -> str:
+    """Text of ``body`` for logs and errors, truncated."""
+    text = body[:_EXCERPT_LIMIT].decode("utf-8", errors="replace")
+    return text if len(body) <= _EXCERPT_LIMIT else f"{text}…"
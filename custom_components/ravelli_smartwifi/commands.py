@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Set
+
+from .errors import RavelliShutdownError
+
+if TYPE_CHECKING:
+    from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+# Command kinds. A later command of the same kind supersedes a pending one.
+COMMAND_POWER = "power"
+COMMAND_SET_TEMP = "set_temp"
+COMMAND_SWITCH = "switch"
+
+
+@dataclass
+class _Command:
+    kind: str
+    value: Any
+    waiters: List[asyncio.Future] = field(default_factory=list)
+
+    def resolve(self, error: BaseException | None = None) -> None:
+        for waiter in self.waiters:
+            if waiter.done():
+                continue
+            if error is None:
+                waiter.set_result(None)
+            else:
+                waiter.set_exception(error)
+
+
+class RavelliCommandQueue:
+    """Send the commands for one stove in order, coalescing superseded writes.
+
+    Only the most recent value of each command kind is sent. When a new value
+    supersedes a pending one and simply puts the stove back where it already is
+    (an ignite followed by a shutdown, a setpoint dragged back to its start),
+    both are dropped; "where it already is" is the value of a write still in
+    flight, if any, and the snapshot otherwise. Pending power and setpoint writes go out concurrently,
+    after any ignition or shutdown. ``on_drained`` runs once with the kinds
+    that were sent after the queue empties.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        execute: Callable[[str, Any], Awaitable[None]],
+        is_current: Callable[[str, Any], bool],
+        on_drained: Callable[[Set[str]], Awaitable[None]],
+        name: str,
+    ) -> None:
+        self._hass = hass
+        self._execute = execute
+        self._is_current = is_current
+        self._on_drained = on_drained
+        self._name = name
+        self._pending: Dict[str, _Command] = {}
+        # Commands being sent, by kind.
+        self._inflight: Dict[str, _Command] = {}
+        self._worker: asyncio.Task | None = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    async def async_submit(self, kind: str, value: Any) -> None:
+        """Queue a command and wait until it (or the one superseding it) ran."""
+        waiter = self._enqueue(kind, value)
+        self._ensure_worker()
+        await waiter
+
+    async def async_submit_many(self, commands: Dict[str, Any]) -> None:
+        """Queue several commands as one batch and wait for all of them.
+
+        The batch is drained in a single pass, so it is confirmed by one read.
+        """
+        waiters = [self._enqueue(kind, value) for kind, value in commands.items()]
+        self._ensure_worker()
+        await asyncio.gather(*waiters)
+
+    def _enqueue(self, kind: str, value: Any) -> asyncio.Future:
+        waiter = self._hass.loop.create_future()
+        previous = self._pending.pop(kind, None)
+        if previous is not None:
+            inflight = self._inflight.get(kind)
+            if (
+                inflight.value == value
+                if inflight is not None
+                else self._is_current(kind, value)
+            ):
+                _LOGGER.debug(
+                    "%s: %s %s cancels pending %s", self._name, kind, value, previous.value
+                )
+                previous.resolve()
+                waiter.set_result(None)
+                return waiter
+            command = _Command(kind, value, previous.waiters)
+        else:
+            command = _Command(kind, value)
+        command.waiters.append(waiter)
+        self._pending[kind] = command
+        return waiter
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._worker = self._hass.async_create_background_task(
+                self._async_drain(), f"ravelli_smartwifi commands {self._name}"
+            )
+
+    async def _async_drain(self) -> None:
+        # Commands submitted while on_drained runs are picked up by the next pass.
+        while self._pending:
+            sent: Set[str] = set()
+            while self._pending:
+                batch, self._pending = self._pending, {}
+                # Ignition/shutdown goes first; power and setpoint are
+                # independent writes and are sent together.
+                switch = batch.pop(COMMAND_SWITCH, None)
+                if switch is not None and await self._async_send(switch):
+                    sent.add(COMMAND_SWITCH)
+                commands = list(batch.values())
+                results = await asyncio.gather(*map(self._async_send, commands))
+                sent.update(c.kind for c, ok in zip(commands, results) if ok)
+            if sent:
+                await self._on_drained(sent)
+
+    async def _async_send(self, command: _Command) -> bool:
+        self._inflight[command.kind] = command
+        try:
+            await self._execute(command.kind, command.value)
+        except Exception as err:
+            command.resolve(err)
+            return False
+        finally:
+            del self._inflight[command.kind]
+        command.resolve()
+        return True
+
+    async def async_shutdown(self) -> None:
+        """Stop sending; callers still waiting get ``RavelliShutdownError``."""
+        commands = [*self._inflight.values(), *self._pending.values()]
+        self._pending.clear()
+        if self._worker is not None:
+            self._worker.cancel()
+        for command in commands:
+            command.resolve(RavelliShutdownError("stove is being unloaded"))
@@ -5,8 +5,42 @@ from homeassistant import config_entries
 from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 
-from .const import DOMAIN, CONF_TOKEN, CONF_BASE_URL, CONF_SCAN_INTERVAL, CONF_DEBUG, DEFAULT_BASE_URL, DEFAULT_SCAN_INTERVAL
+from .const import (
+    DOMAIN,
+    DATA_PROBES,
+    CONF_TOKEN,
+    CONF_BASE_URL,
+    CONF_SCAN_INTERVAL,
+    CONF_DEBUG,
+    CONF_ADAPTIVE_POLLING,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_DEDICATED_POOL,
+    CONF_POOL_LIMIT_PER_HOST,
+    CONF_HOST_RATE_LIMIT,
+    CONF_HOST_RATE_BURST,
+    CONF_TEMP_DEADBAND,
+    CONF_HEDGED_READS,
+    CONF_PELLET_RATES,
+    CONF_RELAY_MODE,
+    CONF_RELAY_TOPIC,
+    CONF_RECORD_TRAFFIC,
+    DEFAULT_BASE_URL,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_POOL_LIMIT_PER_HOST,
+    DEFAULT_TEMP_DEADBAND,
+    DEFAULT_PELLET_RATES,
+    DEFAULT_RELAY_TOPIC,
+    HOST_RATE_BURST,
+    HOST_RATE_LIMIT,
+    RELAY_MODES,
+    RELAY_OFF,
+)
 from .api import RavelliSmartWifiClient
+from .counters import parse_pellet_rates
+from .errors import RavelliUnsuccessfulError
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -23,12 +57,18 @@ class ConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 debug=user_input.get(CONF_DEBUG, False),
             )
             try:
-                await client.async_get_status()
+                await client.async_probe()
+            except RavelliUnsuccessfulError:
+                errors["base"] = "invalid_auth"
             except Exception:
                 errors["base"] = "cannot_connect"
             else:
                 await self.async_set_unique_id(user_input[CONF_TOKEN])
                 self._abort_if_unique_id_configured()
+                # Handed to the new entry's coordinator as its first snapshot.
+                self.hass.data.setdefault(DOMAIN, {}).setdefault(DATA_PROBES, {})[
+                    user_input[CONF_TOKEN]
+                ] = client.cached_fields()
                 title_token = user_input[CONF_TOKEN][:8]
                 return self.async_create_entry(
                     title=f"Ravelli {title_token}",
@@ -59,12 +99,34 @@ class OptionsFlow(config_entries.OptionsFlow):
         self.entry = entry
 
     async def async_step_init(self, user_input=None):
+        errors = {}
         if user_input is not None:
-            return self.async_create_entry(title="Options", data=user_input)
+            try:
+                parse_pellet_rates(user_input[CONF_PELLET_RATES])
+            except ValueError:
+                errors[CONF_PELLET_RATES] = "invalid_pellet_rates"
+            topic = user_input[CONF_RELAY_TOPIC].strip("/")
+            if not topic or "+" in topic or "#" in topic:
+                errors[CONF_RELAY_TOPIC] = "invalid_relay_topic"
+            if not errors:
+                return self.async_create_entry(title="Options", data=user_input)
 
         schema = vol.Schema({
             vol.Required(CONF_SCAN_INTERVAL, default=self.entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)): int,
             vol.Required(CONF_BASE_URL, default=self.entry.options.get(CONF_BASE_URL, self.entry.data.get(CONF_BASE_URL))): str,
             vol.Required(CONF_DEBUG, default=self.entry.options.get(CONF_DEBUG, self.entry.data.get(CONF_DEBUG, False))): bool,
+            vol.Required(CONF_ADAPTIVE_POLLING, default=self.entry.options.get(CONF_ADAPTIVE_POLLING, False)): bool,
+            vol.Required(CONF_MIN_SCAN_INTERVAL, default=self.entry.options.get(CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL)): vol.All(int, vol.Range(min=5)),
+            vol.Required(CONF_MAX_SCAN_INTERVAL, default=self.entry.options.get(CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL)): vol.All(int, vol.Range(min=5)),
+            vol.Required(CONF_DEDICATED_POOL, default=self.entry.options.get(CONF_DEDICATED_POOL, False)): bool,
+            vol.Required(CONF_POOL_LIMIT_PER_HOST, default=self.entry.options.get(CONF_POOL_LIMIT_PER_HOST, DEFAULT_POOL_LIMIT_PER_HOST)): vol.All(int, vol.Range(min=1, max=100)),
+            vol.Required(CONF_HOST_RATE_LIMIT, default=self.entry.options.get(CONF_HOST_RATE_LIMIT, HOST_RATE_LIMIT)): vol.All(vol.Coerce(float), vol.Range(min=0.5, max=50)),
+            vol.Required(CONF_HOST_RATE_BURST, default=self.entry.options.get(CONF_HOST_RATE_BURST, HOST_RATE_BURST)): vol.All(int, vol.Range(min=1, max=100)),
+            vol.Required(CONF_TEMP_DEADBAND, default=self.entry.options.get(CONF_TEMP_DEADBAND, DEFAULT_TEMP_DEADBAND)): vol.All(vol.Coerce(float), vol.Range(min=0, max=5)),
+            vol.Required(CONF_HEDGED_READS, default=self.entry.options.get(CONF_HEDGED_READS, False)): bool,
+            vol.Required(CONF_PELLET_RATES, default=self.entry.options.get(CONF_PELLET_RATES, DEFAULT_PELLET_RATES)): str,
+            vol.Required(CONF_RELAY_MODE, default=self.entry.options.get(CONF_RELAY_MODE, RELAY_OFF)): vol.In(RELAY_MODES),
+            vol.Required(CONF_RELAY_TOPIC, default=self.entry.options.get(CONF_RELAY_TOPIC, DEFAULT_RELAY_TOPIC)): str,
+            vol.Required(CONF_RECORD_TRAFFIC, default=self.entry.options.get(CONF_RECORD_TRAFFIC, False)): bool,
         })
-        return self.async_show_form(step_id="init", data_schema=schema)
+        return self.async_show_form(step_id="init", data_schema=schema, errors=errors)
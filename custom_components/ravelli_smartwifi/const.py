@@ -5,6 +5,95 @@ CONF_TOKEN = "token"
 CONF_BASE_URL = "base_url"
 CONF_SCAN_INTERVAL = "scan_interval"
 CONF_DEBUG = "debug"
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+CONF_MIN_SCAN_INTERVAL = "min_scan_interval"
+CONF_MAX_SCAN_INTERVAL = "max_scan_interval"
+CONF_DEDICATED_POOL = "dedicated_pool"
+CONF_POOL_LIMIT_PER_HOST = "pool_limit_per_host"
+CONF_HOST_RATE_LIMIT = "host_rate_limit"
+CONF_HOST_RATE_BURST = "host_rate_burst"
+CONF_TEMP_DEADBAND = "temperature_deadband"
+CONF_HEDGED_READS = "hedged_reads"
+CONF_PELLET_RATES = "pellet_consumption"
+CONF_RELAY_MODE = "relay_mode"
+CONF_RELAY_TOPIC = "relay_topic"
+CONF_RECORD_TRAFFIC = "record_traffic"
+
+# Relay over MQTT: one instance polls and publishes, the others subscribe.
+RELAY_OFF = "off"
+RELAY_PUBLISH = "publish"
+RELAY_SUBSCRIBE = "subscribe"
+RELAY_MODES = [RELAY_OFF, RELAY_PUBLISH, RELAY_SUBSCRIBE]
 
 DEFAULT_BASE_URL = "https://ws.cloudwinet.it/WiNetStove.svc/json"
 DEFAULT_SCAN_INTERVAL = 30
+DEFAULT_MIN_SCAN_INTERVAL = 10
+DEFAULT_MAX_SCAN_INTERVAL = 300
+DEFAULT_TEMP_DEADBAND = 0.0
+# Pellet burn rate (kg/h) at power levels 1..5; rough figures for a 7-9 kW
+# stove, meant to be adjusted in the options.
+DEFAULT_PELLET_RATES = "0.6, 0.9, 1.2, 1.5, 1.9"
+DEFAULT_RELAY_TOPIC = "ravelli_smartwifi"
+# Unchanged snapshots are republished at least this often (s) so that
+# subscribers can tell a quiet stove from a dead publisher.
+RELAY_HEARTBEAT = 300
+# Subscribers mark the stove unavailable after this long without a snapshot.
+RELAY_STALE_AFTER = 2 * RELAY_HEARTBEAT + 60
+# How long a subscriber waits for the retained snapshot at setup (s).
+RELAY_SETUP_TIMEOUT = 10
+# A poll fails once the status is older than this many times the longest
+# poll interval.
+STALE_STATUS_FACTOR = 2
+# Longest gap between two polls integrated into the runtime counters (s).
+COUNTER_MAX_GAP = 900
+DEFAULT_SLOW_REFRESH_INTERVAL = 300
+SINGLE_FLIGHT_WINDOW = 2.0
+DEFAULT_POLL_BUDGET = 10.0
+REQUEST_TIMEOUT = 30
+PROBE_TIMEOUT = 10
+PROBE_REUSE_WINDOW = 30
+# Default requests per second (and burst) allowed to one API host across all
+# entries, adjustable in the options; polls that would queue longer than
+# HOST_POLL_MAX_DELAY are shed.
+HOST_RATE_LIMIT = 4.0
+HOST_RATE_BURST = 8
+HOST_POLL_MAX_DELAY = 5.0
+# Retries of a failed read (jittered exponential backoff from the base delay),
+# and the per-host circuit breaker: consecutive failures before it opens and
+# its cooldown, doubled on every failed probe up to the maximum.
+RETRY_ATTEMPTS = 2
+RETRY_BASE_DELAY = 0.5
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_COOLDOWN = 30
+CIRCUIT_MAX_COOLDOWN = 600
+# Hedged reads: a duplicate is sent once a read outlives the endpoint's p90
+# (measured over at least HEDGE_MIN_SAMPLES requests, never below
+# HEDGE_MIN_DELAY). Each host may spend HEDGE_BUDGET_RATIO hedges per regular
+# request, saving up to HEDGE_BUDGET_BURST.
+HEDGE_QUANTILE = 0.9
+HEDGE_MIN_SAMPLES = 20
+HEDGE_MIN_DELAY = 0.05
+HEDGE_BUDGET_RATIO = 0.1
+HEDGE_BUDGET_BURST = 10
+# Traffic capture: buffered lines are written after RECORD_FLUSH_DELAY (s),
+# and recording stops once a capture file reaches RECORD_MAX_BYTES.
+RECORD_FLUSH_DELAY = 1.0
+RECORD_MAX_BYTES = 50 * 2**20
+DEFAULT_POOL_LIMIT_PER_HOST = 4
+POOL_DNS_CACHE_TTL = 300
+POOL_KEEPALIVE_TIMEOUT = 60
+
+DATA_FLEET = "fleet"
+DATA_POOLS = "pools"
+DATA_PROBES = "probes"
+
+STORAGE_VERSION = 1
+# Snapshots and counters are written at most this long (s) after the first
+# change since the last write; scheduled commands are written right away.
+STORAGE_SAVE_DELAY = 60
+# Poll interval while a scheduled command waits for a status, and how many
+# failed sends it gets before being dropped.
+SCHEDULER_WATCH_INTERVAL = 5
+SCHEDULER_MAX_ATTEMPTS = 3
+DEFAULT_FLEET_MAX_CONCURRENT = 4
+FLEET_JITTER = 0.1
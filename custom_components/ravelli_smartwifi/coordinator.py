@@ -2,8 +2,9 @@ from __future__ import annotations
 
 from datetime import timedelta
 import logging
+import time
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
@@ -13,106 +14,550 @@ from .const import (
     CONF_BASE_URL,
     CONF_SCAN_INTERVAL,
     CONF_DEBUG,
+    CONF_ADAPTIVE_POLLING,
+    CONF_MIN_SCAN_INTERVAL,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_DEDICATED_POOL,
+    CONF_POOL_LIMIT_PER_HOST,
+    CONF_HOST_RATE_LIMIT,
+    CONF_HOST_RATE_BURST,
+    CONF_TEMP_DEADBAND,
+    CONF_HEDGED_READS,
+    CONF_PELLET_RATES,
+    CONF_RELAY_MODE,
+    CONF_RELAY_TOPIC,
+    CONF_RECORD_TRAFFIC,
     DEFAULT_BASE_URL,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_MIN_SCAN_INTERVAL,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_POOL_LIMIT_PER_HOST,
+    DEFAULT_TEMP_DEADBAND,
+    DEFAULT_PELLET_RATES,
+    DEFAULT_RELAY_TOPIC,
     DOMAIN,
+    HOST_RATE_BURST,
+    HOST_RATE_LIMIT,
+    RELAY_OFF,
+    RELAY_SUBSCRIBE,
+    STALE_STATUS_FACTOR,
 )
 from .api import RavelliSmartWifiClient
+from .commands import (
+    COMMAND_POWER,
+    COMMAND_SET_TEMP,
+    COMMAND_SWITCH,
+    RavelliCommandQueue,
+)
+from .counters import COUNTERS_KEY, RavelliCounters, parse_pellet_rates
+from .fleet import RavelliFleetPoller
+from .history import RavelliHistory
+from .relay import (
+    COMMAND_APPLY_PROFILE,
+    COMMAND_CANCEL_SCHEDULED,
+    COMMAND_SCHEDULE,
+    RavelliRelay,
+)
+from .pool import RavelliConnectionPool, async_acquire_pool, async_release_pool
+from .record import TrafficRecorder
+from .scheduler import (
+    ACTION_SET_POWER,
+    ACTION_SET_TEMPERATURE,
+    ACTION_TURN_OFF,
+    ACTION_TURN_ON,
+    RavelliCommandScheduler,
+)
+from .state import STATUS_OFF, StoveState
+from .storage import RavelliStore
 
 _LOGGER = logging.getLogger(__name__)
 
-class RavelliCoordinator(DataUpdateCoordinator):
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+# Snapshot field re-read to confirm each kind of command.
+_CONFIRM_FIELDS = {
+    COMMAND_POWER: "power",
+    COMMAND_SET_TEMP: "set_temp",
+    COMMAND_SWITCH: "status",
+}
+
+class RavelliCoordinator(DataUpdateCoordinator[StoveState]):
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        fleet: RavelliFleetPoller | None = None,
+        store: RavelliStore | None = None,
+    ) -> None:
         self.entry = entry
-        session = async_get_clientsession(hass)
+        self.fleet = fleet
+        self.store = store
         self.token = entry.data[CONF_TOKEN]
         self.base_url = entry.options.get(
             CONF_BASE_URL, entry.data.get(CONF_BASE_URL, DEFAULT_BASE_URL)
         )
+        self.pool: RavelliConnectionPool | None = None
+        if entry.options.get(CONF_DEDICATED_POOL, False):
+            self.pool = async_acquire_pool(
+                hass,
+                self.base_url,
+                int(entry.options.get(CONF_POOL_LIMIT_PER_HOST, DEFAULT_POOL_LIMIT_PER_HOST)),
+            )
+            session = self.pool.session
+        else:
+            session = async_get_clientsession(hass)
         self.device_name = entry.title or f"Ravelli Stove {self.token[:4].upper()}"
-        self._pending_ignition = False
         debug_enabled = entry.options.get(CONF_DEBUG, entry.data.get(CONF_DEBUG, False))
+        self.recorder: TrafficRecorder | None = None
+        if entry.options.get(CONF_RECORD_TRAFFIC, False):
+            self.recorder = TrafficRecorder(
+                hass.config.path(f"{DOMAIN}.{entry.entry_id}.traffic.jsonl")
+            )
         self.client = RavelliSmartWifiClient(
-            session, self.base_url, self.token, debug=debug_enabled
+            session,
+            self.base_url,
+            self.token,
+            debug=debug_enabled,
+            hedged_reads=bool(entry.options.get(CONF_HEDGED_READS, False)),
+            recorder=self.recorder,
+            rate_limit=float(entry.options.get(CONF_HOST_RATE_LIMIT, HOST_RATE_LIMIT)),
+            rate_burst=int(entry.options.get(CONF_HOST_RATE_BURST, HOST_RATE_BURST)),
+        )
+        self.scan_interval = int(
+            entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+        )
+        self.adaptive_polling = bool(entry.options.get(CONF_ADAPTIVE_POLLING, False))
+        self.min_scan_interval = int(
+            entry.options.get(CONF_MIN_SCAN_INTERVAL, DEFAULT_MIN_SCAN_INTERVAL)
         )
-        scan_int = int(entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL))
+        self.max_scan_interval = max(
+            self.min_scan_interval,
+            int(entry.options.get(CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL)),
+        )
+        self.temperature_deadband = float(
+            entry.options.get(CONF_TEMP_DEADBAND, DEFAULT_TEMP_DEADBAND)
+        )
+        self.changed_keys: frozenset[str] = frozenset()
+        self.history = RavelliHistory()
+        try:
+            pellet_rates = parse_pellet_rates(
+                entry.options.get(CONF_PELLET_RATES, DEFAULT_PELLET_RATES)
+            )
+        except ValueError as err:
+            _LOGGER.warning("%s, using the default model", err)
+            pellet_rates = parse_pellet_rates(DEFAULT_PELLET_RATES)
+        self.counters = RavelliCounters(
+            pellet_rates, store.counters if store is not None else {}
+        )
+        self._last_status_code: int | None = None
+        self._steady_polls = 0
+        self.commands = RavelliCommandQueue(
+            hass,
+            self._async_execute,
+            self._is_current,
+            self._async_confirm,
+            name=self.token[:4],
+        )
+        self.scheduler = RavelliCommandScheduler(
+            hass,
+            store,
+            self._async_run_scheduled,
+            self._async_poll_within,
+            name=self.token[:4],
+        )
+        relay_mode = entry.options.get(CONF_RELAY_MODE, RELAY_OFF)
+        self.relay: RavelliRelay | None = None
+        if relay_mode != RELAY_OFF:
+            self.relay = RavelliRelay(
+                hass,
+                self,
+                relay_mode,
+                entry.options.get(CONF_RELAY_TOPIC, DEFAULT_RELAY_TOPIC),
+            )
+        # When a fleet poller is attached it owns the schedule, so the
+        # coordinator itself never arms a refresh timer.
         super().__init__(
             hass,
             _LOGGER,
             name="Ravelli Smart Wi‑Fi Coordinator",
-            update_interval=timedelta(seconds=scan_int),
+            update_interval=None
+            if fleet is not None or self.is_relay_subscriber
+            else timedelta(seconds=self.scan_interval),
         )
 
-    async def _async_update_data(self):
+    @property
+    def is_relay_subscriber(self) -> bool:
+        """True when snapshots come from another instance instead of the cloud."""
+        return self.relay is not None and self.relay.mode == RELAY_SUBSCRIBE
+
+    @property
+    def poll_interval(self) -> float:
+        """Seconds until the next scheduled poll of this stove."""
+        interval = self._scheduled_interval()
+        if (check := self.scheduler.next_check()) is not None:
+            # A scheduled command is waiting for a state or a time.
+            interval = min(interval, check)
+        # While the API host's circuit is open, wait for its next probe slot.
+        return max(interval, self.client.circuit.retry_in)
+
+    @property
+    def stale_after(self) -> float:
+        """Age (s) past which the last known status is no longer served."""
+        longest = self.max_scan_interval if self.adaptive_polling else self.scan_interval
+        return float(STALE_STATUS_FACTOR * longest)
+
+    def _scheduled_interval(self) -> float:
+        if not self.adaptive_polling:
+            return float(self.scan_interval)
+        if (
+            self.pending_ignition
+            or self.is_final_cleaning
+            or self.is_starting
+            or self._steady_polls == 0
+        ):
+            # Transitional: start-up/ignition, cleaning, a queued ignition or
+            # a status that just changed. Poll fast so the UI follows the
+            # stove, even when the same start-up status is seen repeatedly.
+            return float(self.min_scan_interval)
+        # Steady (off or heating with an unchanged status): back off
+        # exponentially towards the configured ceiling.
+        backoff = self.min_scan_interval * (2 ** min(self._steady_polls, 16))
+        return float(min(backoff, self.max_scan_interval))
+
+    def _track_status(self, status_code: int | None) -> None:
+        if status_code == self._last_status_code:
+            self._steady_polls += 1
+            return
+        self._last_status_code = status_code
+        self._steady_polls = 0
+        self._async_poll_soon()
+
+    @callback
+    def _async_poll_within(self, delay: float) -> None:
+        if self.fleet is not None:
+            self.fleet.async_poll_within(self.entry.entry_id, delay)
+
+    def _async_poll_soon(self) -> None:
+        if not self.adaptive_polling:
+            return
+        if self.fleet is not None:
+            self.fleet.async_poll_within(self.entry.entry_id, self.poll_interval)
+        else:
+            self.update_interval = timedelta(seconds=self.poll_interval)
+
+    async def _async_update_data(self) -> StoveState:
+        if self.is_relay_subscriber:
+            # A manual refresh must not reach the cloud: the publisher polls.
+            if self.data is None or not self.relay.live:
+                raise UpdateFailed("No snapshot from the relay publisher")
+            return self.data
         try:
-            data = await self.client.async_get_status()
+            if self.fleet is not None:
+                state = await self.fleet.async_fetch(self)
+            else:
+                state = await self.client.async_get_status()
         except Exception as err:
             raise UpdateFailed(str(err)) from err
+        age = time.time() - (state.updated_at.get("status") or 0.0)
+        if age > self.stale_after:
+            # Partial polls keep the last known status; past this bound the
+            # stove is effectively unreachable.
+            raise UpdateFailed(f"Status not refreshed for {age:.0f} s")
+
+        await self.scheduler.async_evaluate(state)
+        self._track_status(state.status_code)
+        if self.fleet is None and self.adaptive_polling:
+            self.update_interval = timedelta(seconds=self.poll_interval)
+        if (
+            self.data is not None
+            and self.data.optimistic_on is not None
+            and state.updated_at.get("status") == self.data.updated_at.get("status")
+        ):
+            # The status was not re-read: the command is still unconfirmed.
+            state = state.replace(optimistic_on=self.data.optimistic_on)
+        state = self._prepare_snapshot(state)
+        now = time.time()
+        self.history.record(now, state)
+        if self.counters.update(now, state):
+            self.changed_keys |= {COUNTERS_KEY}
+            if self.store is not None:
+                self.store.async_save_counters(self.counters.as_dict())
+        return state
+
+    async def async_set_temperature(self, temperature: float) -> None:
+        target = int(round(float(temperature)))
+        if self.is_relay_subscriber:
+            await self.relay.async_forward(ACTION_SET_TEMPERATURE, target)
+            return
+        await self.commands.async_submit(COMMAND_SET_TEMP, target)
+
+    async def async_set_power(self, power: int) -> None:
+        if self.is_relay_subscriber:
+            await self.relay.async_forward(ACTION_SET_POWER, int(power))
+            return
+        await self.commands.async_submit(COMMAND_POWER, int(power))
 
-        status_code = data.get("status_code")
-        if self._pending_ignition:
-            if status_code == 0:
-                try:
-                    await self.client.async_turn_on()
-                except Exception as err:
-                    _LOGGER.warning(
-                        "Deferred ignition failed for stove %s: %s",
-                        self.token[:4],
-                        err,
-                    )
-                else:
-                    self._pending_ignition = False
-            elif data.get("is_on") and status_code not in (0, 6):
-                # Stove already restarted via another command; clear the queue.
-                self._pending_ignition = False
-
-        data["pending_ignition"] = self._pending_ignition
-        data["is_on_effective"] = self._derive_effective_state(
-            status_code, data.get("is_on")
+    async def async_turn_on(self) -> None:
+        if self.is_relay_subscriber:
+            await self.relay.async_forward(ACTION_TURN_ON)
+            return
+        if self.is_final_cleaning:
+            self.queue_ignition_after_cleaning()
+        else:
+            self.cancel_pending_ignition()
+        await self.commands.async_submit(COMMAND_SWITCH, True)
+
+    async def async_turn_off(self) -> None:
+        if self.is_relay_subscriber:
+            await self.relay.async_forward(ACTION_TURN_OFF)
+            return
+        self.cancel_pending_ignition()
+        await self.commands.async_submit(COMMAND_SWITCH, False)
+
+    async def async_apply_profile(
+        self,
+        is_on: bool | None = None,
+        power: int | None = None,
+        temperature: float | None = None,
+    ) -> None:
+        """Bring the stove to the given targets in one batch.
+
+        Only the values that differ from the snapshot are sent, and the batch
+        is confirmed by a single read once it went out.
+        """
+        if self.is_relay_subscriber:
+            await self.relay.async_forward(
+                COMMAND_APPLY_PROFILE,
+                {"is_on": is_on, "power": power, "temperature": temperature},
+            )
+            return
+        batch = {}
+        if power is not None and not self._is_current(COMMAND_POWER, int(power)):
+            batch[COMMAND_POWER] = int(power)
+        if temperature is not None:
+            target = int(round(float(temperature)))
+            if not self._is_current(COMMAND_SET_TEMP, target):
+                batch[COMMAND_SET_TEMP] = target
+        if is_on is not None:
+            if is_on and self.is_final_cleaning:
+                self.queue_ignition_after_cleaning()
+            else:
+                self.cancel_pending_ignition()
+            if not self._is_current(COMMAND_SWITCH, is_on):
+                batch[COMMAND_SWITCH] = is_on
+        if batch:
+            await self.commands.async_submit_many(batch)
+
+    async def _async_execute(self, kind: str, value) -> None:
+        """Send one queued command and publish the value it wrote.
+
+        Entities update immediately from the optimistic snapshot; the queue
+        confirms everything it sent with one targeted read once it drains.
+        """
+        if kind == COMMAND_SWITCH:
+            if value:
+                await self.client.async_turn_on()
+            else:
+                await self.client.async_turn_off()
+            self._async_merge({"is_on": value, "optimistic_on": value})
+        elif kind == COMMAND_POWER:
+            await self.client.async_set_power(value)
+            self._async_merge({"power": value})
+        else:
+            await self.client.async_set_temperature(value)
+            self._async_merge({"set_temp": value})
+
+    async def _async_run_scheduled(self, action: str, value) -> None:
+        """Send a command the scheduler found due; the next poll confirms it."""
+        if action == ACTION_TURN_ON:
+            await self.client.async_turn_on()
+        elif action == ACTION_TURN_OFF:
+            await self.client.async_turn_off()
+        elif action == ACTION_SET_POWER:
+            await self.client.async_set_power(value)
+        elif action == ACTION_SET_TEMPERATURE:
+            await self.client.async_set_temperature(value)
+        else:
+            raise ValueError(f"unknown scheduled action {action!r}")
+
+    def _is_current(self, kind: str, value) -> bool:
+        if self.data is None:
+            return False
+        if kind == COMMAND_SWITCH:
+            return self.data.is_on == value
+        return getattr(self.data, kind) == value
+
+    async def _async_confirm(self, kinds: set[str]) -> None:
+        fields = {_CONFIRM_FIELDS[kind] for kind in kinds}
+        try:
+            changes = await self.client.async_read(*fields)
+        except Exception as err:
+            # The next scheduled poll will reconcile the snapshot.
+            _LOGGER.debug(
+                "Confirming %s failed for stove %s: %s",
+                ", ".join(sorted(fields)),
+                self.token[:4],
+                err,
+            )
+            return
+        if "status_code" in changes:
+            self._track_status(changes["status_code"])
+            changes["optimistic_on"] = None
+        if self.data is not None:
+            # The fields just read back are fresh again.
+            read_at = time.time()
+            changes["updated_at"] = {
+                **self.data.updated_at,
+                **dict.fromkeys(fields, read_at),
+            }
+            changes["stale_fields"] = tuple(
+                field for field in self.data.stale_fields if field not in fields
+            )
+        self._async_merge(changes)
+
+    async def async_shutdown(self) -> None:
+        await super().async_shutdown()
+        if self.relay is not None:
+            await self.relay.async_stop()
+        self.scheduler.async_shutdown()
+        await self.commands.async_shutdown()
+        if self.recorder is not None:
+            await self.recorder.async_close()
+        if self.pool is not None:
+            await async_release_pool(self.hass, self.pool)
+            self.pool = None
+
+    @callback
+    def _async_merge(self, changes: dict) -> None:
+        if self.data is None:
+            return
+        state = self._prepare_snapshot(self.data.replace(**changes))
+        self.async_set_updated_data(state)
+
+    @callback
+    def async_restore(self, state: StoveState) -> None:
+        """Publish a snapshot restored from storage before the first live poll."""
+        state = state.replace(
+            pending_ignition=self.pending_ignition,
+            scheduled_commands=self.scheduler.describe(),
+        )
+        self.changed_keys = state.diff(None)
+        self.async_set_updated_data(state)
+
+    @callback
+    def async_relay_update(self, state: StoveState) -> None:
+        """Publish a snapshot received from the relay publisher.
+
+        It already carries the publisher's deadband and scheduled commands;
+        history and counters are kept locally as for a poll.
+        """
+        self.changed_keys = state.diff(self.data)
+        if self.store is not None:
+            self.store.async_save_snapshot(state)
+        now = time.time()
+        self.history.record(now, state)
+        if self.counters.update(now, state):
+            self.changed_keys |= {COUNTERS_KEY}
+            if self.store is not None:
+                self.store.async_save_counters(self.counters.as_dict())
+        self.async_set_updated_data(state)
+
+    @callback
+    def async_relay_unavailable(self, reason: str) -> None:
+        _LOGGER.warning("Stove %s: %s", self.token[:4], reason)
+        self.async_set_update_error(UpdateFailed(reason))
+
+    def _prepare_snapshot(self, state: StoveState) -> StoveState:
+        """Turn a new snapshot into the one to publish.
+
+        Ambient temperature moves within the deadband are folded back into the
+        previous value so that entities watching it are not rewritten for noise.
+        The scheduler's pending commands are attached, the fields that differ
+        from the published snapshot are recorded, and the result is queued for
+        persistence.
+        """
+        previous = self.data
+        state = state.replace(
+            pending_ignition=self.pending_ignition,
+            scheduled_commands=self.scheduler.describe(),
         )
-        return data
+        if (
+            previous is not None
+            and self.temperature_deadband
+            and previous.ambient_temp is not None
+            and state.ambient_temp is not None
+            and abs(state.ambient_temp - previous.ambient_temp) < self.temperature_deadband
+        ):
+            state = state.replace(ambient_temp=previous.ambient_temp)
+        self.changed_keys = state.diff(previous)
+        if self.store is not None:
+            self.store.async_save_snapshot(state)
+        return state
 
     @property
     def status_code(self) -> int | None:
-        data = self.data or {}
-        return data.get("status_code")
+        return self.data.status_code if self.data is not None else None
 
     @property
     def is_final_cleaning(self) -> bool:
-        return self.status_code == 6
+        return self.data is not None and self.data.is_final_cleaning
+
+    @property
+    def is_starting(self) -> bool:
+        return self.data is not None and self.data.is_starting
 
     def queue_ignition_after_cleaning(self) -> None:
-        if not self._pending_ignition:
+        if not self.pending_ignition:
             _LOGGER.info(
                 "Ignition queued after cleaning for stove ending with %s",
                 self.token[:4],
             )
-        self._pending_ignition = True
+            self.scheduler.async_add(ACTION_TURN_ON, when_status=STATUS_OFF)
+        self._async_merge({})
 
     def cancel_pending_ignition(self) -> None:
-        if self._pending_ignition:
+        if self.scheduler.async_cancel(ACTION_TURN_ON, when_status=STATUS_OFF):
             _LOGGER.info(
                 "Cancelled pending ignition request for stove ending with %s",
                 self.token[:4],
             )
-        self._pending_ignition = False
+            self._async_merge({})
+
+    @callback
+    def async_schedule(
+        self,
+        action: str,
+        value=None,
+        when_status: int | None = None,
+        not_before: float | None = None,
+    ) -> str | None:
+        if self.is_relay_subscriber:
+            self.relay.async_forward_later(
+                COMMAND_SCHEDULE,
+                {
+                    "action": action,
+                    "value": value,
+                    "when_status": when_status,
+                    "not_before": not_before,
+                },
+            )
+            return None
+        command_id = self.scheduler.async_add(action, value, when_status, not_before)
+        self._async_merge({})
+        return command_id
+
+    @callback
+    def async_cancel_scheduled(self, action: str | None = None) -> None:
+        if self.is_relay_subscriber:
+            self.relay.async_forward_later(COMMAND_CANCEL_SCHEDULED, action)
+            return
+        if self.scheduler.async_cancel(action):
+            self._async_merge({})
 
     @property
     def pending_ignition(self) -> bool:
-        return self._pending_ignition
+        if self.is_relay_subscriber:
+            return self.data is not None and self.data.pending_ignition
+        return self.scheduler.has(ACTION_TURN_ON, when_status=STATUS_OFF)
 
     @property
     def effective_is_on(self) -> bool:
-        data = self.data or {}
-        return self._derive_effective_state(self.status_code, data.get("is_on"))
-
-    def _derive_effective_state(
-        self, status_code: int | None, raw_is_on: bool | None
-    ) -> bool:
-        if status_code in (None, 0):
-            return False
-        if status_code == 6:
-            return self._pending_ignition
-        if raw_is_on is not None:
-            return bool(raw_is_on)
-        return True
+        return self.data is not None and self.data.is_on_effective
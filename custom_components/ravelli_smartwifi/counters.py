@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from typing import Any, Dict, Sequence
+
+from .const import COUNTER_MAX_GAP
+from .state import StoveState
+
+COUNTER_BURNER_HOURS = "burner_hours"
+COUNTER_IGNITIONS = "ignitions"
+COUNTER_CLEANINGS = "cleanings"
+COUNTER_PELLETS = "pellet_kg"
+COUNTERS = (COUNTER_BURNER_HOURS, COUNTER_IGNITIONS, COUNTER_CLEANINGS, COUNTER_PELLETS)
+# Added to the coordinator's ``changed_keys`` when a counter moved.
+COUNTERS_KEY = "counters"
+
+
+def parse_pellet_rates(value: str) -> tuple[float, ...]:
+    """Parse "0.6, 0.9, ..." (kg/h for power level 1, 2, ...)."""
+    parts = value.replace(";", ",").split(",")
+    rates = tuple(float(part) for part in parts if part.strip())
+    if not rates or any(rate < 0 for rate in rates):
+        raise ValueError(f"invalid pellet consumption model: {value!r}")
+    return rates
+
+
+class RavelliCounters:
+    """Lifetime counters updated incrementally from consecutive snapshots.
+
+    Between two live polls the previous snapshot is assumed to have held:
+    burner time accrues while the stove was on, pellets at the model's rate
+    for its power level. Gaps longer than ``COUNTER_MAX_GAP`` (restarts,
+    outages) are not integrated. Ignitions and final cleanings are counted
+    on the transitions into them.
+    """
+
+    def __init__(self, pellet_rates: Sequence[float], stored: Dict[str, Any]) -> None:
+        self._pellet_rates = tuple(pellet_rates)
+        self.values: Dict[str, float] = {
+            name: float(stored.get(name, 0)) for name in COUNTERS
+        }
+        self._last_time: float | None = None
+        self._last_state: StoveState | None = None
+
+    def _pellet_rate(self, power: float | None) -> float:
+        if power is None or not self._pellet_rates:
+            return 0.0
+        level = min(max(int(round(power)), 1), len(self._pellet_rates))
+        return self._pellet_rates[level - 1]
+
+    def update(self, when: float, state: StoveState) -> bool:
+        """Account for the time since the previous snapshot.
+
+        Returns True when a counter moved.
+        """
+        if "status" in state.stale_fields:
+            return False
+        previous, last_time = self._last_state, self._last_time
+        self._last_state, self._last_time = state, when
+        if previous is None or last_time is None:
+            return False
+
+        moved = False
+        elapsed = when - last_time
+        if previous.is_on and 0 < elapsed <= COUNTER_MAX_GAP:
+            hours = elapsed / 3600
+            self.values[COUNTER_BURNER_HOURS] += hours
+            self.values[COUNTER_PELLETS] += hours * self._pellet_rate(previous.power)
+            moved = True
+        if state.is_on and not previous.is_on:
+            self.values[COUNTER_IGNITIONS] += 1
+            moved = True
+        if state.is_final_cleaning and not previous.is_final_cleaning:
+            self.values[COUNTER_CLEANINGS] += 1
+            moved = True
+        return moved
+
+    def as_dict(self) -> Dict[str, float]:
+        return dict(self.values)
+
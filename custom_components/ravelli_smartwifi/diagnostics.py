@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import time
+from typing import Any, Dict
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_TOKEN, DOMAIN
+from .coordinator import RavelliCoordinator
+from .history import FIELDS as HISTORY_FIELDS
+
+# Windows (seconds) of the history aggregates in the download.
+HISTORY_WINDOWS = {"15m": 900, "1h": 3600, "24h": 86400}
+
+TO_REDACT = {CONF_TOKEN}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> Dict[str, Any]:
+    coordinator: RavelliCoordinator = hass.data[DOMAIN][entry.entry_id]
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "poll_interval": coordinator.poll_interval,
+        "pool": coordinator.pool.stats() if coordinator.pool is not None else None,
+        "rate_limiter": (
+            coordinator.client.rate_limiter.stats()
+            if coordinator.client.rate_limiter is not None
+            else None
+        ),
+        "circuit": coordinator.client.circuit.stats(),
+        "hedge_budget": (
+            coordinator.client.hedge_budget.stats()
+            if coordinator.client.hedge_budget is not None
+            else None
+        ),
+        "metrics": coordinator.client.metrics.as_dict(),
+        "relay": coordinator.relay.stats() if coordinator.relay is not None else None,
+        "recorder": (
+            coordinator.recorder.stats() if coordinator.recorder is not None else None
+        ),
+        "stale_age": (
+            time.time() - coordinator.data.stale_since
+            if coordinator.data is not None and coordinator.data.stale_since is not None
+            else None
+        ),
+        "data": coordinator.data.as_dict() if coordinator.data is not None else None,
+        "history": _history(coordinator),
+    }
+
+
+def _history(coordinator: RavelliCoordinator) -> Dict[str, Any]:
+    now = time.time()
+    history = coordinator.history
+    return {
+        "tiers": history.stats(),
+        "last_status_change": history.last_status_change(),
+        "windows": {
+            field: {
+                label: history.window(field, seconds, now)
+                for label, seconds in HISTORY_WINDOWS.items()
+            }
+            for field in HISTORY_FIELDS
+        },
+    }
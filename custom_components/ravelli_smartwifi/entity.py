@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from homeassistant.core import callback
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+from .coordinator import RavelliCoordinator
+
+
+class RavelliEntity(CoordinatorEntity[RavelliCoordinator]):
+    """Base entity writing state only when a snapshot key it shows changed.
+
+    ``_watched_keys`` lists the snapshot keys the entity's state and
+    attributes are built from; ``None`` means "write on every update".
+    """
+
+    _watched_keys: frozenset[str] | None = None
+
+    def __init__(self, coordinator: RavelliCoordinator) -> None:
+        super().__init__(coordinator)
+        self._last_available: bool | None = None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        available = self.available
+        if (
+            available == self._last_available
+            and self._watched_keys is not None
+            and self._watched_keys.isdisjoint(self.coordinator.changed_keys)
+        ):
+            return
+        self._last_available = available
+        super()._handle_coordinator_update()
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        return DeviceInfo(
+            identifiers={(DOMAIN, self.coordinator.token)},
+            manufacturer="Ravelli",
+            model="Smart Wi‑Fi",
+            name=self.coordinator.device_name,
+            configuration_url=self.coordinator.base_url,
+        )
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+
+class RavelliApiError(RuntimeError):
+    """Base class for CloudWiNet request failures.
+
+    ``retryable`` tells whether sending the same request again may succeed,
+    and whether the failure counts against the host's circuit breaker.
+    """
+
+    retryable = False
+
+
+class RavelliTransportError(RavelliApiError):
+    """Connection error or timeout before a response arrived."""
+
+    retryable = True
+
+
+class RavelliHttpError(RavelliApiError):
+    """Non-200 HTTP response; 5xx and 429 are worth retrying."""
+
+    def __init__(self, message: str, status: int) -> None:
+        super().__init__(message)
+        self.status = status
+        self.retryable = status >= 500 or status == 429
+
+
+class RavelliInvalidResponseError(RavelliApiError):
+    """Response body was not valid JSON (typically a proxy error page)."""
+
+    retryable = True
+
+
+class RavelliUnsuccessfulError(RavelliApiError):
+    """The API answered ``Success=false``, e.g. for an unknown token."""
+
+
+class RavelliCircuitOpenError(RavelliApiError):
+    """Request not sent: the host's circuit breaker is open."""
+
+
+class RavelliRateLimitedError(RavelliApiError):
+    """A background poll request was shed because the host is saturated."""
+
+
+class RavelliShutdownError(RavelliApiError):
+    """Command not sent, or its outcome unknown: the stove is being unloaded."""
+
+
+class RavelliPollError(RavelliApiError):
+    """A poll could not produce a status: it was never read successfully."""
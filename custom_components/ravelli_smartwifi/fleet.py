@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+from typing import TYPE_CHECKING, Callable, Dict
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import DEFAULT_FLEET_MAX_CONCURRENT, FLEET_JITTER
+from .state import StoveState
+
+if TYPE_CHECKING:
+    from .coordinator import RavelliCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Fractional part of the golden ratio: successive slots land as far as possible
+# from every slot already taken, whatever the number of stoves.
+_SLOT_SPREAD = 0.6180339887498949
+
+
+class RavelliFleetPoller:
+    """Integration-wide scheduler polling every configured stove on its own slot."""
+
+    def __init__(
+        self, hass: HomeAssistant, max_concurrent: int = DEFAULT_FLEET_MAX_CONCURRENT
+    ) -> None:
+        self._hass = hass
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._coordinators: Dict[str, RavelliCoordinator] = {}
+        self._timers: Dict[str, Callable[[], None]] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._due: Dict[str, float] = {}
+        self._slots = 0
+
+    @property
+    def entry_ids(self) -> list[str]:
+        return list(self._coordinators)
+
+    @callback
+    def async_register(
+        self, coordinator: RavelliCoordinator, just_polled: bool = False
+    ) -> None:
+        """Give the stove its slot; ``just_polled`` when setup already polled it,
+        so that its first scheduled poll is not an immediate second one."""
+        entry_id = coordinator.entry.entry_id
+        self.async_unregister(entry_id)
+        self._coordinators[entry_id] = coordinator
+        offset = (self._slots * _SLOT_SPREAD) % 1.0
+        self._slots += 1
+        if just_polled and not offset:
+            offset = 1.0
+        self._async_schedule(entry_id, coordinator.poll_interval * offset)
+
+    @callback
+    def async_poll_within(self, entry_id: str, delay: float) -> None:
+        """Bring the next poll forward so it happens at most ``delay`` seconds from now."""
+        if entry_id not in self._coordinators or entry_id in self._tasks:
+            return
+        due = self._hass.loop.time() + delay
+        if due < self._due.get(entry_id, float("inf")):
+            self._async_schedule(entry_id, delay)
+
+    @callback
+    def async_unregister(self, entry_id: str) -> None:
+        self._coordinators.pop(entry_id, None)
+        self._due.pop(entry_id, None)
+        if (cancel := self._timers.pop(entry_id, None)) is not None:
+            cancel()
+        if (task := self._tasks.pop(entry_id, None)) is not None:
+            task.cancel()
+
+    async def async_shutdown(self) -> None:
+        for entry_id in list(self._coordinators):
+            self.async_unregister(entry_id)
+
+    async def async_fetch(self, coordinator: RavelliCoordinator) -> StoveState:
+        """Fetch one stove status while holding a fleet-wide concurrency slot."""
+        async with self._semaphore:
+            return await coordinator.client.async_get_status()
+
+    @callback
+    def _async_schedule(self, entry_id: str, delay: float) -> None:
+        if (cancel := self._timers.pop(entry_id, None)) is not None:
+            cancel()
+
+        @callback
+        def _fire(_now) -> None:
+            self._timers.pop(entry_id, None)
+            self._due.pop(entry_id, None)
+            self._tasks[entry_id] = self._hass.async_create_background_task(
+                self._async_poll(entry_id), f"ravelli_smartwifi poll {entry_id}"
+            )
+
+        delay = max(delay, 0.0)
+        self._due[entry_id] = self._hass.loop.time() + delay
+        self._timers[entry_id] = async_call_later(self._hass, delay, _fire)
+
+    async def _async_poll(self, entry_id: str) -> None:
+        coordinator = self._coordinators.get(entry_id)
+        if coordinator is None:
+            return
+        try:
+            await coordinator.async_refresh()
+        finally:
+            self._tasks.pop(entry_id, None)
+            if entry_id in self._coordinators:
+                interval = coordinator.poll_interval
+                jitter = random.uniform(-FLEET_JITTER, FLEET_JITTER)
+                self._async_schedule(entry_id, interval * (1.0 + jitter))
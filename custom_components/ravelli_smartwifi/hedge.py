@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from typing import Any, Dict
+from urllib.parse import urlsplit
+
+from .metrics import LatencyHistogram
+
+
+class HedgeBudget:
+    """Cap duplicate reads to a fraction of the requests sent to one host.
+
+    Every regular request earns ``ratio`` of a hedge, up to ``burst`` saved
+    hedges; each duplicate read spends one. While a host is slow across the
+    board the budget drains, and hedging stops adding load to it.
+
+    It also keeps the host's response times per endpoint, fed by every
+    client with hedged reads, so a new client hedges from its first read
+    and all of them pick the same delay.
+    """
+
+    def __init__(self, ratio: float, burst: int) -> None:
+        self._ratio = ratio
+        self._burst = float(burst)
+        self._tokens = float(burst)
+        self._latency: Dict[str, LatencyHistogram] = {}
+        self.spent = 0
+        self.denied = 0
+
+    def observe(self, endpoint: str, seconds: float) -> None:
+        latency = self._latency.get(endpoint)
+        if latency is None:
+            latency = self._latency[endpoint] = LatencyHistogram()
+        latency.add(seconds)
+
+    def latency(self, endpoint: str) -> LatencyHistogram | None:
+        return self._latency.get(endpoint)
+
+    def earn(self) -> None:
+        self._tokens = min(self._burst, self._tokens + self._ratio)
+
+    def try_spend(self) -> bool:
+        if self._tokens < 1:
+            self.denied += 1
+            return False
+        self._tokens -= 1
+        self.spent += 1
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "tokens": round(self._tokens, 2),
+            "spent": self.spent,
+            "denied": self.denied,
+            "latency": {
+                endpoint: latency.as_dict()
+                for endpoint, latency in self._latency.items()
+            },
+        }
+
+
+class HedgeBudgetRegistry:
+    """One ``HedgeBudget`` per host."""
+
+    def __init__(self, ratio: float, burst: int) -> None:
+        self._ratio = ratio
+        self._burst = burst
+        self._budgets: Dict[str, HedgeBudget] = {}
+
+    def get(self, base_url: str) -> HedgeBudget:
+        host = urlsplit(base_url).netloc.lower()
+        budget = self._budgets.get(host)
+        if budget is None:
+            budget = self._budgets[host] = HedgeBudget(self._ratio, self._burst)
+        return budget
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+from array import array
+import math
+from typing import Any, Dict, Iterator, List, Tuple
+
+from .state import StoveState
+
+# Numeric snapshot fields kept in the history; missing values are NaN.
+FIELDS = ("ambient_temp", "set_temp", "power")
+# (name, bucket width in seconds, rows kept): ~2 h of raw polls, a day of
+# 1-minute means and a week of 15-minute means.
+TIERS = (("raw", 0, 240), ("1min", 60, 1440), ("15min", 900, 672))
+
+_NAN = float("nan")
+_NO_STATUS = -1
+
+
+class _Ring:
+    """Fixed-capacity ring of rows stored column-wise in typed arrays."""
+
+    __slots__ = ("capacity", "size", "_next", "time", "columns", "status")
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.size = 0
+        self._next = 0
+        self.time = array("d", bytes(8 * capacity))
+        self.columns = {name: array("f", bytes(4 * capacity)) for name in FIELDS}
+        self.status = array("h", bytes(2 * capacity))
+
+    def append(self, when: float, values: Tuple[float, ...], status: int) -> None:
+        index = self._next
+        self.time[index] = when
+        for name, value in zip(FIELDS, values):
+            self.columns[name][index] = value
+        self.status[index] = status
+        self._next = (index + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    @property
+    def oldest(self) -> float | None:
+        if not self.size:
+            return None
+        return self.time[(self._next - self.size) % self.capacity]
+
+    def indices_since(self, since: float) -> Iterator[int]:
+        """Indices of the rows at or after ``since``, oldest first."""
+        for offset in range(self.size, 0, -1):
+            index = (self._next - offset) % self.capacity
+            if self.time[index] >= since:
+                yield index
+
+
+class _Bucket:
+    """Running means of the samples falling into one downsampling bucket."""
+
+    __slots__ = ("start", "sums", "counts", "status")
+
+    def __init__(self, start: float) -> None:
+        self.start = start
+        self.sums = [0.0] * len(FIELDS)
+        self.counts = [0] * len(FIELDS)
+        self.status = _NO_STATUS
+
+    def add(self, values: Tuple[float, ...], status: int) -> None:
+        for i, value in enumerate(values):
+            if not math.isnan(value):
+                self.sums[i] += value
+                self.counts[i] += 1
+        if status != _NO_STATUS:
+            self.status = status
+
+    def row(self) -> Tuple[float, ...]:
+        return tuple(
+            total / count if count else _NAN
+            for total, count in zip(self.sums, self.counts)
+        )
+
+
+class RavelliHistory:
+    """Bounded in-memory telemetry history of one stove.
+
+    Every live snapshot is appended to the raw tier and folded into the
+    running bucket of each downsampled tier, which is written out as one row
+    (field means, last status) when the next bucket starts. Memory is fixed
+    at construction: about 52 KB per stove with the default tiers.
+    """
+
+    def __init__(self) -> None:
+        self._tiers = [
+            (name, width, _Ring(capacity)) for name, width, capacity in TIERS
+        ]
+        self._buckets: Dict[str, _Bucket] = {}
+
+    def record(self, when: float, state: StoveState) -> None:
+        values = tuple(
+            _NAN
+            if name in state.stale_fields or (value := getattr(state, name)) is None
+            else float(value)
+            for name in FIELDS
+        )
+        status = (
+            _NO_STATUS
+            if "status" in state.stale_fields or state.status_code is None
+            else int(state.status_code)
+        )
+        for name, width, ring in self._tiers:
+            if not width:
+                ring.append(when, values, status)
+                continue
+            start = when - when % width
+            bucket = self._buckets.get(name)
+            if bucket is not None and bucket.start != start:
+                ring.append(bucket.start, bucket.row(), bucket.status)
+                bucket = None
+            if bucket is None:
+                bucket = self._buckets[name] = _Bucket(start)
+            bucket.add(values, status)
+
+    def _ring_for(self, since: float) -> _Ring:
+        """Finest tier reaching back to ``since``, else the one reaching furthest."""
+        rings = [ring for _, _, ring in self._tiers if ring.size]
+        for ring in rings:
+            if ring.oldest <= since:
+                return ring
+        if not rings:
+            return self._tiers[0][2]
+        return min(rings, key=lambda ring: ring.oldest)
+
+    def series(
+        self, field: str, seconds: float, now: float
+    ) -> List[Tuple[float, float]]:
+        """``(timestamp, value)`` points of ``field`` over the last ``seconds``."""
+        since = now - seconds
+        ring = self._ring_for(since)
+        column = ring.columns[field]
+        return [
+            (ring.time[index], column[index])
+            for index in ring.indices_since(since)
+            if not math.isnan(column[index])
+        ]
+
+    def window(self, field: str, seconds: float, now: float) -> Dict[str, Any]:
+        """Min, max, mean and least-squares slope (per hour) of ``field``."""
+        points = self.series(field, seconds, now)
+        if not points:
+            return {"count": 0, "min": None, "max": None, "mean": None, "slope": None}
+        values = [value for _, value in points]
+        mean = sum(values) / len(values)
+        slope = None
+        if len(points) > 1:
+            mean_t = sum(when for when, _ in points) / len(points)
+            var_t = sum((when - mean_t) ** 2 for when, _ in points)
+            if var_t:
+                cov = sum((when - mean_t) * (value - mean) for when, value in points)
+                slope = round(cov / var_t * 3600, 3)
+        return {
+            "count": len(values),
+            "min": round(min(values), 2),
+            "max": round(max(values), 2),
+            "mean": round(mean, 2),
+            "slope": slope,
+        }
+
+    def last_status_change(self) -> float | None:
+        """Time of the latest raw sample whose status differs from the one before."""
+        ring = self._tiers[0][2]
+        previous = None
+        changed = None
+        for index in ring.indices_since(float("-inf")):
+            status = ring.status[index]
+            if status == _NO_STATUS:
+                continue
+            if previous is not None and status != previous:
+                changed = ring.time[index]
+            previous = status
+        return changed
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            name: {
+                "rows": ring.size,
+                "capacity": ring.capacity,
+                "oldest": ring.oldest,
+            }
+            for name, _, ring in self._tiers
+        }
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import math
+from array import array
+from typing import Any, Dict
+
+# Log-spaced latency buckets: 5 ms up to ~60 s, each bucket 20% wider than the
+# previous one. The last bucket also collects everything slower.
+_BUCKET_BASE = 0.005
+_BUCKET_GROWTH = 1.2
+_BUCKET_COUNT = 52
+_LOG_GROWTH = math.log(_BUCKET_GROWTH)
+
+ERROR_HTTP = "http"
+ERROR_JSON = "json"
+ERROR_UNSUCCESSFUL = "unsuccessful"
+ERROR_TRANSPORT = "transport"
+ERROR_KINDS = (ERROR_HTTP, ERROR_JSON, ERROR_UNSUCCESSFUL, ERROR_TRANSPORT)
+
+
+class LatencyHistogram:
+    """Fixed-size log-bucketed histogram of durations in seconds."""
+
+    __slots__ = ("_counts", "count", "total", "max")
+
+    def __init__(self) -> None:
+        self._counts = array("L", bytes(array("L").itemsize * _BUCKET_COUNT))
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    @staticmethod
+    def _bucket(seconds: float) -> int:
+        if seconds <= _BUCKET_BASE:
+            return 0
+        index = int(math.log(seconds / _BUCKET_BASE) / _LOG_GROWTH) + 1
+        return min(index, _BUCKET_COUNT - 1)
+
+    def add(self, seconds: float) -> None:
+        self._counts[self._bucket(seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> float | None:
+        """Return the upper bound of the bucket holding the ``q`` quantile."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, bucket in enumerate(self._counts):
+            seen += bucket
+            if seen >= rank:
+                return min(_BUCKET_BASE * _BUCKET_GROWTH**index, self.max)
+        return self.max
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "max": self.max if self.count else None,
+        }
+
+
+class EndpointMetrics:
+    """Request, error, byte and latency counters for one endpoint."""
+
+    __slots__ = ("requests", "errors", "bytes", "latency")
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.errors = dict.fromkeys(ERROR_KINDS, 0)
+        self.bytes = 0
+        self.latency = LatencyHistogram()
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": dict(self.errors),
+            "bytes": self.bytes,
+            "latency": self.latency.as_dict(),
+        }
+
+
+class ClientMetrics:
+    """Instrumentation collected by one ``RavelliSmartWifiClient``."""
+
+    def __init__(self) -> None:
+        self.endpoints: Dict[str, EndpointMetrics] = {}
+        self.polls = LatencyHistogram()
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    def endpoint(self, name: str) -> EndpointMetrics:
+        metrics = self.endpoints.get(name)
+        if metrics is None:
+            metrics = self.endpoints[name] = EndpointMetrics()
+        return metrics
+
+    def record_request(self, endpoint: str, seconds: float, size: int) -> None:
+        metrics = self.endpoint(endpoint)
+        metrics.requests += 1
+        metrics.bytes += size
+        metrics.latency.add(seconds)
+
+    def record_error(self, endpoint: str, kind: str) -> None:
+        self.endpoint(endpoint).errors[kind] += 1
+
+    @property
+    def requests(self) -> int:
+        return sum(metrics.requests for metrics in self.endpoints.values())
+
+    @property
+    def errors(self) -> int:
+        return sum(
+            sum(metrics.errors.values()) for metrics in self.endpoints.values()
+        )
+
+    @property
+    def bytes(self) -> int:
+        return sum(metrics.bytes for metrics in self.endpoints.values())
+
+    def latency_quantile(self, q: float) -> float | None:
+        """Return the worst per-endpoint ``q`` latency quantile."""
+        values = [
+            value
+            for metrics in self.endpoints.values()
+            if (value := metrics.latency.quantile(q)) is not None
+        ]
+        return max(values) if values else None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "bytes": self.bytes,
+            "retries": self.retries,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "polls": self.polls.as_dict(),
+            "endpoints": {
+                name: metrics.as_dict() for name, metrics in self.endpoints.items()
+            },
+        }
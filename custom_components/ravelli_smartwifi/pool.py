@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util.ssl import get_default_context
+
+from .const import DATA_POOLS, DOMAIN, POOL_DNS_CACHE_TTL, POOL_KEEPALIVE_TIMEOUT
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class RavelliConnectionPool:
+    """Dedicated keep-alive connection pool for one CloudWiNet host."""
+
+    def __init__(self, origin: str, limit_per_host: int) -> None:
+        self.origin = origin
+        self.limit_per_host = limit_per_host
+        self.users = 0
+        self._created = 0
+        self._reused = 0
+        trace = aiohttp.TraceConfig()
+        trace.on_connection_create_end.append(self._on_create)
+        trace.on_connection_reuseconn.append(self._on_reuse)
+        self._connector = aiohttp.TCPConnector(
+            limit_per_host=limit_per_host,
+            ttl_dns_cache=POOL_DNS_CACHE_TTL,
+            keepalive_timeout=POOL_KEEPALIVE_TIMEOUT,
+            ssl=get_default_context(),
+            enable_cleanup_closed=True,
+        )
+        self.session = aiohttp.ClientSession(
+            connector=self._connector, trace_configs=[trace]
+        )
+
+    async def _on_create(self, _session, _ctx, _params) -> None:
+        self._created += 1
+
+    async def _on_reuse(self, _session, _ctx, _params) -> None:
+        self._reused += 1
+
+    async def async_warm_up(self) -> None:
+        """Open one connection up front so the first poll reuses a warm socket."""
+        try:
+            async with self.session.head(
+                self.origin, timeout=aiohttp.ClientTimeout(total=10)
+            ) as resp:
+                await resp.release()
+        except (aiohttp.ClientError, TimeoutError) as err:
+            _LOGGER.debug("Warm-up connection to %s failed: %s", self.origin, err)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "origin": self.origin,
+            "limit_per_host": self.limit_per_host,
+            "users": self.users,
+            "connections_created": self._created,
+            "connections_reused": self._reused,
+            "closed": self.session.closed,
+        }
+
+    async def async_close(self) -> None:
+        await self.session.close()
+
+
+def _origin(base_url: str) -> str:
+    parts = urlsplit(base_url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def async_acquire_pool(
+    hass: HomeAssistant, base_url: str, limit_per_host: int
+) -> RavelliConnectionPool:
+    """Return the shared pool for ``base_url``'s host, creating it on first use."""
+    pools: Dict[str, RavelliConnectionPool] = hass.data.setdefault(
+        DOMAIN, {}
+    ).setdefault(DATA_POOLS, {})
+    origin = _origin(base_url)
+    pool = pools.get(origin)
+    if pool is None or pool.session.closed:
+        pool = pools[origin] = RavelliConnectionPool(origin, limit_per_host)
+    pool.users += 1
+    return pool
+
+
+async def async_release_pool(hass: HomeAssistant, pool: RavelliConnectionPool) -> None:
+    pool.users -= 1
+    if pool.users > 0:
+        return
+    pools: Dict[str, RavelliConnectionPool] = hass.data.get(DOMAIN, {}).get(DATA_POOLS, {})
+    if pools.get(pool.origin) is pool:
+        del pools[pool.origin]
+    await pool.async_close()
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Any, Dict, List, Tuple
+from urllib.parse import urlsplit
+
+from .errors import RavelliRateLimitedError
+
+# Priority classes, lower is served first. Commands the user is waiting for
+# go ahead of confirmations and the config flow, which go ahead of polls.
+PRIORITY_COMMAND = 0
+PRIORITY_INTERACTIVE = 1
+PRIORITY_POLL = 2
+
+
+class HostRateLimiter:
+    """Token bucket shared by every request to one CloudWiNet host.
+
+    Tokens refill at ``rate`` per second up to ``burst``. When the bucket is
+    empty, waiters are released strictly by priority, then arrival order.
+    A poll request that would wait longer than ``max_poll_delay`` is shed
+    with ``RavelliRateLimitedError`` instead of queueing; its field stays
+    stale.
+    """
+
+    def __init__(self, rate: float, burst: int, max_poll_delay: float) -> None:
+        self._rate = rate
+        self._burst = float(burst)
+        self._max_poll_delay = max_poll_delay
+        self._tokens = float(burst)
+        self._stamp = time.monotonic()
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._order = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+        self.granted = 0
+        self.delayed = 0
+        self.shed = 0
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    @property
+    def burst(self) -> int:
+        return int(self._burst)
+
+    def configure(self, rate: float, burst: int) -> None:
+        """Apply new limits; queued requests are released at the new rate."""
+        self._refill(time.monotonic())
+        self._rate = rate
+        self._burst = float(burst)
+        self._tokens = min(self._tokens, self._burst)
+        if self._timer is not None:
+            self._timer.cancel()
+            self._release()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self._burst, self._tokens + (now - self._stamp) * self._rate)
+        self._stamp = now
+
+    async def acquire(self, priority: int) -> None:
+        self._refill(time.monotonic())
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            self.granted += 1
+            return
+        if priority >= PRIORITY_POLL:
+            # Everybody queued is served before this poll.
+            wait = (len(self._waiters) + 1 - self._tokens) / self._rate
+            if wait > self._max_poll_delay:
+                self.shed += 1
+                raise RavelliRateLimitedError(
+                    f"request shed, host busy for {wait:.1f}s"
+                )
+
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._order), waiter))
+        self.delayed += 1
+        if self._timer is None:
+            self._release()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Granted just as the caller gave up: hand the token back.
+                self._tokens += 1
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        self._timer = None
+        self._refill(time.monotonic())
+        while self._waiters and (self._tokens >= 1 or self._waiters[0][2].done()):
+            _, _, waiter = heapq.heappop(self._waiters)
+            if waiter.done():
+                continue
+            self._tokens -= 1
+            self.granted += 1
+            waiter.set_result(None)
+        if self._waiters:
+            self._timer = asyncio.get_running_loop().call_later(
+                (1 - self._tokens) / self._rate, self._release
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        self._refill(time.monotonic())
+        return {
+            "rate": self._rate,
+            "burst": int(self._burst),
+            "tokens": round(self._tokens, 2),
+            "queued": sum(not waiter.done() for *_, waiter in self._waiters),
+            "granted": self.granted,
+            "delayed": self.delayed,
+            "shed": self.shed,
+        }
+
+
+class RateLimiterRegistry:
+    """One ``HostRateLimiter`` per host; a non-positive rate disables limiting."""
+
+    def __init__(self, rate: float, burst: int, max_poll_delay: float) -> None:
+        self._rate = rate
+        self._burst = burst
+        self._max_poll_delay = max_poll_delay
+        self._limiters: Dict[str, HostRateLimiter] = {}
+
+    def get(
+        self, base_url: str, rate: float | None = None, burst: int | None = None
+    ) -> HostRateLimiter | None:
+        """Return the host's limiter; ``rate``/``burst`` override the defaults
+        and reconfigure an existing limiter (the last caller wins)."""
+        if self._rate <= 0:
+            return None
+        host = urlsplit(base_url).netloc.lower()
+        limiter = self._limiters.get(host)
+        if limiter is None:
+            limiter = self._limiters[host] = HostRateLimiter(
+                self._rate if rate is None else rate,
+                self._burst if burst is None else burst,
+                self._max_poll_delay,
+            )
+        elif rate is not None and burst is not None:
+            if (rate, burst) != (limiter.rate, limiter.burst):
+                limiter.configure(rate, burst)
+        return limiter
@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+import hashlib
+import json
+from typing import Any, Deque, Dict, Iterable, Iterator, List
+
+import aiohttp
+
+from .const import RECORD_FLUSH_DELAY, RECORD_MAX_BYTES
+
+_SEPARATORS = (",", ":")
+
+
+def stove_key(token: str) -> str:
+    """Stable identifier of a stove that does not expose its token."""
+    return hashlib.sha256(token.encode()).hexdigest()[:16]
+
+
+class TrafficRecorder:
+    """Append every API exchange to a JSON-lines capture file.
+
+    One line per request sent on the wire (retries and hedges included):
+    ``t`` wall-clock start, ``ep`` endpoint, ``url`` with the token replaced
+    by its ``stove_key``, ``ms`` duration, then either ``st``/``b`` (HTTP
+    status, body) or ``err`` (transport error class). Lines are buffered and
+    written from the executor; recording stops once the file reaches
+    ``max_bytes``.
+    """
+
+    def __init__(self, path: str, max_bytes: int = RECORD_MAX_BYTES) -> None:
+        self.path = path
+        self._max_bytes = max_bytes
+        self._lines: List[str] = []
+        self._flush: asyncio.TimerHandle | None = None
+        self._writing: asyncio.Future | None = None
+        self.size: int | None = None
+        self.recorded = 0
+        self.dropped = 0
+
+    def record(
+        self,
+        endpoint: str,
+        url: str,
+        started: float,
+        elapsed: float,
+        status: int | None = None,
+        body: bytes = b"",
+        error: str | None = None,
+    ) -> None:
+        if self.size is not None and self.size >= self._max_bytes:
+            self.dropped += 1
+            return
+        entry: Dict[str, Any] = {
+            "t": round(started, 3),
+            "ep": endpoint,
+            "url": url,
+            "ms": round(elapsed * 1000, 1),
+        }
+        if error is not None:
+            entry["err"] = error
+        else:
+            entry["st"] = status
+            entry["b"] = body.decode("utf-8", "replace")
+        self._lines.append(
+            json.dumps(entry, separators=_SEPARATORS, ensure_ascii=False)
+        )
+        self.recorded += 1
+        if self._flush is None:
+            self._flush = asyncio.get_running_loop().call_later(
+                RECORD_FLUSH_DELAY, self._start_flush
+            )
+
+    def _start_flush(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._writing is not None and not self._writing.done():
+            self._flush = loop.call_later(RECORD_FLUSH_DELAY, self._start_flush)
+            return
+        self._flush = None
+        lines, self._lines = self._lines, []
+        self._writing = loop.run_in_executor(None, self._write, lines)
+
+    def _write(self, lines: List[str]) -> None:
+        with open(self.path, "a", encoding="utf-8") as capture:
+            capture.write("\n".join(lines) + "\n")
+            self.size = capture.tell()
+
+    async def async_close(self) -> None:
+        """Write out whatever is still buffered."""
+        if self._flush is not None:
+            self._flush.cancel()
+            self._flush = None
+        if self._writing is not None:
+            await self._writing
+        if self._lines:
+            lines, self._lines = self._lines, []
+            await asyncio.get_running_loop().run_in_executor(None, self._write, lines)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "recorded": self.recorded,
+            "dropped": self.dropped,
+            "bytes": self.size,
+        }
+
+
+def read_capture(paths: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Yield the entries of one or more capture files in file order."""
+    for path in paths:
+        with open(path, encoding="utf-8") as capture:
+            for line in capture:
+                if line.strip():
+                    yield json.loads(line)
+
+
+class _ReplayResponse:
+    def __init__(self, status: int, body: bytes) -> None:
+        self.status = status
+        self._body = body
+
+    async def read(self) -> bytes:
+        return self._body
+
+
+class _ReplayRequest:
+    def __init__(self, session: ReplaySession, url: str) -> None:
+        self._session = session
+        self._url = url
+
+    async def __aenter__(self) -> _ReplayResponse:
+        return await self._session.async_respond(self._url)
+
+    async def __aexit__(self, *exc) -> None:
+        return None
+
+
+class ReplaySession:
+    """Stand-in for ``aiohttp.ClientSession`` answering from a capture.
+
+    Each URL gets its recorded responses back in order, after the recorded
+    duration divided by ``speed`` (0 answers at once). A client created with
+    ``stove_key(token)`` as its token requests exactly the recorded URLs.
+    Requests with no recorded response left fail like a refused connection.
+    """
+
+    def __init__(self, entries: Iterable[Dict[str, Any]], speed: float = 1.0) -> None:
+        self._speed = speed
+        self._responses: Dict[str, Deque[Dict[str, Any]]] = {}
+        for entry in entries:
+            self._responses.setdefault(entry["url"], deque()).append(entry)
+        self.served = 0
+        self.missing = 0
+        self.closed = False
+
+    def get(self, url: str, **kwargs: Any) -> _ReplayRequest:
+        return _ReplayRequest(self, url)
+
+    async def async_respond(self, url: str) -> _ReplayResponse:
+        queue = self._responses.get(url)
+        if not queue:
+            self.missing += 1
+            raise aiohttp.ClientConnectionError("no recorded response left")
+        entry = queue.popleft()
+        self.served += 1
+        if self._speed > 0:
+            await asyncio.sleep(entry["ms"] / 1000 / self._speed)
+        if (error := entry.get("err")) is not None:
+            if error in ("TimeoutError", "ServerTimeoutError"):
+                raise asyncio.TimeoutError
+            raise aiohttp.ClientConnectionError(f"recorded {error}")
+        return _ReplayResponse(entry["st"], entry["b"].encode("utf-8"))
+
+    @property
+    def remaining(self) -> int:
+        return sum(len(queue) for queue in self._responses.values())
+
+    async def close(self) -> None:
+        self.closed = True
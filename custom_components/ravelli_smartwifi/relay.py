@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+import json
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Dict, List
+
+import voluptuous as vol
+from homeassistant.components import mqtt
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+
+from .const import RELAY_HEARTBEAT, RELAY_PUBLISH, RELAY_STALE_AFTER
+from .counters import COUNTERS_KEY
+from .record import stove_key
+from .scheduler import (
+    ACTION_SET_POWER,
+    ACTION_SET_TEMPERATURE,
+    ACTION_TURN_OFF,
+    ACTION_TURN_ON,
+    ACTIONS,
+)
+from .services import (
+    APPLY_PROFILE_FIELDS,
+    COMMAND_FIELDS,
+    POWER,
+    TEMPERATURE,
+    command_value,
+)
+from .state import StoveState
+
+if TYPE_CHECKING:
+    from .coordinator import RavelliCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Commands forwarded on the command topic, besides the scheduler actions.
+COMMAND_APPLY_PROFILE = "apply_profile"
+COMMAND_SCHEDULE = "schedule"
+COMMAND_CANCEL_SCHEDULED = "cancel_scheduled"
+
+# The value each relayed command carries, checked like the matching service.
+COMMAND_VALUES = {
+    ACTION_TURN_ON: vol.Any(None),
+    ACTION_TURN_OFF: vol.Any(None),
+    ACTION_SET_POWER: POWER,
+    ACTION_SET_TEMPERATURE: TEMPERATURE,
+    COMMAND_APPLY_PROFILE: vol.Schema(APPLY_PROFILE_FIELDS),
+    COMMAND_SCHEDULE: vol.All(
+        vol.Schema(
+            {**COMMAND_FIELDS, vol.Optional("not_before"): vol.Coerce(float)}
+        ),
+        command_value,
+    ),
+    COMMAND_CANCEL_SCHEDULED: vol.Any(None, vol.In(ACTIONS)),
+}
+
+ONLINE = "online"
+OFFLINE = "offline"
+
+
+class RavelliRelay:
+    """Share one stove between Home Assistant instances over MQTT.
+
+    The publisher polls the cloud as usual, publishes its snapshot (retained)
+    to ``<prefix>/<key>/state`` whenever it changed, and at least every
+    ``RELAY_HEARTBEAT`` seconds, and runs the commands it receives on
+    ``<prefix>/<key>/command`` through its own coordinator. Subscribers never
+    poll: they take their snapshots from the state topic and forward their
+    commands, so the cloud sees one poller per stove.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: RavelliCoordinator,
+        mode: str,
+        prefix: str,
+    ) -> None:
+        self._hass = hass
+        self._coordinator = coordinator
+        self.mode = mode
+        base = f"{prefix.strip('/')}/{stove_key(coordinator.token)}"
+        self.state_topic = f"{base}/state"
+        self.command_topic = f"{base}/command"
+        self.availability_topic = f"{base}/availability"
+        self._unsubscribers: List[CALLBACK_TYPE] = []
+        self._stale_timer: CALLBACK_TYPE | None = None
+        self._received = asyncio.Event()
+        self._published_state: StoveState | None = None
+        self._published_at = 0.0
+        self.live = False
+        self.published = 0
+        self.received = 0
+        self.commands = 0
+
+    @property
+    def is_publisher(self) -> bool:
+        return self.mode == RELAY_PUBLISH
+
+    async def async_start(self) -> None:
+        if not await mqtt.async_wait_for_mqtt_client(self._hass):
+            raise ConfigEntryNotReady("MQTT is not available for the relay")
+        if self.is_publisher:
+            self._unsubscribers.append(
+                await mqtt.async_subscribe(
+                    self._hass, self.command_topic, self._async_command_received, qos=1
+                )
+            )
+            self._unsubscribers.append(
+                self._coordinator.async_add_listener(self._async_coordinator_updated)
+            )
+            self._unsubscribers.append(
+                async_track_time_interval(
+                    self._hass,
+                    self._async_heartbeat,
+                    timedelta(seconds=RELAY_HEARTBEAT),
+                )
+            )
+            await mqtt.async_publish(
+                self._hass, self.availability_topic, ONLINE, qos=1, retain=True
+            )
+            self._async_coordinator_updated()
+        else:
+            self._unsubscribers.append(
+                await mqtt.async_subscribe(
+                    self._hass, self.state_topic, self._async_state_received, qos=1
+                )
+            )
+            self._unsubscribers.append(
+                await mqtt.async_subscribe(
+                    self._hass,
+                    self.availability_topic,
+                    self._async_availability_received,
+                    qos=1,
+                )
+            )
+
+    async def async_wait_for_state(self, timeout: float) -> bool:
+        """Wait for the publisher's (retained) snapshot; False on timeout."""
+        try:
+            await asyncio.wait_for(self._received.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def async_stop(self) -> None:
+        started = bool(self._unsubscribers)
+        for unsubscribe in self._unsubscribers:
+            unsubscribe()
+        self._unsubscribers.clear()
+        self._cancel_stale_timer()
+        if self.is_publisher and started:
+            await mqtt.async_publish(
+                self._hass, self.availability_topic, OFFLINE, qos=1, retain=True
+            )
+
+    async def async_forward(self, action: str, value: Any = None) -> None:
+        """Send a command to the publishing instance."""
+        if isinstance(value, dict):
+            # Unset fields are left out, as in a service call.
+            value = {key: item for key, item in value.items() if item is not None}
+        payload = json.dumps({"action": action, "value": value})
+        await mqtt.async_publish(self._hass, self.command_topic, payload, qos=1)
+        self.commands += 1
+
+    @callback
+    def async_forward_later(self, action: str, value: Any = None) -> None:
+        self._coordinator.entry.async_create_background_task(
+            self._hass,
+            self.async_forward(action, value),
+            f"ravelli_smartwifi relay {action}",
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "state_topic": self.state_topic,
+            "live": self.live,
+            "published": self.published,
+            "received": self.received,
+            "commands": self.commands,
+        }
+
+    # Publisher side.
+
+    @callback
+    def _async_coordinator_updated(self) -> None:
+        state = self._coordinator.data
+        if state is None or state is self._published_state:
+            return
+        now = time.monotonic()
+        if (
+            self._published_state is not None
+            # Counters are kept by each instance, not relayed.
+            and not self._coordinator.changed_keys - {COUNTERS_KEY}
+            and now - self._published_at < RELAY_HEARTBEAT
+        ):
+            return
+        self._async_publish(state, now)
+
+    @callback
+    def _async_heartbeat(self, _now) -> None:
+        # Independent of polling, which may be slower than subscribers'
+        # patience; a publisher whose polls fail lets them go stale.
+        state = self._coordinator.data
+        if (
+            state is None
+            or not self._coordinator.last_update_success
+            or time.monotonic() - self._published_at < RELAY_HEARTBEAT / 2
+        ):
+            return
+        self._async_publish(state, time.monotonic())
+
+    @callback
+    def _async_publish(self, state: StoveState, now: float) -> None:
+        self._published_state = state
+        self._published_at = now
+        payload = json.dumps(
+            {"published_at": time.time(), "state": state.as_dict()}, default=str
+        )
+        self._coordinator.entry.async_create_background_task(
+            self._hass,
+            mqtt.async_publish(
+                self._hass, self.state_topic, payload, qos=1, retain=True
+            ),
+            "ravelli_smartwifi relay publish",
+        )
+        self.published += 1
+
+    @callback
+    def _async_command_received(self, msg: mqtt.ReceiveMessage) -> None:
+        try:
+            command = json.loads(msg.payload)
+            action = command["action"]
+            schema = COMMAND_VALUES[action]
+        except (ValueError, TypeError, KeyError):
+            _LOGGER.warning("Ignoring malformed relay command on %s", msg.topic)
+            return
+        try:
+            value = schema(command.get("value"))
+        except vol.Invalid as err:
+            _LOGGER.warning("Ignoring invalid relayed %s: %s", action, err)
+            return
+        self.commands += 1
+        self._coordinator.entry.async_create_background_task(
+            self._hass,
+            self._async_run_command(action, value),
+            f"ravelli_smartwifi relayed {action}",
+        )
+
+    async def _async_run_command(self, action: str, value: Any) -> None:
+        coordinator = self._coordinator
+        try:
+            if action == ACTION_TURN_ON:
+                await coordinator.async_turn_on()
+            elif action == ACTION_TURN_OFF:
+                await coordinator.async_turn_off()
+            elif action == ACTION_SET_POWER:
+                await coordinator.async_set_power(value)
+            elif action == ACTION_SET_TEMPERATURE:
+                await coordinator.async_set_temperature(value)
+            elif action == COMMAND_APPLY_PROFILE:
+                await coordinator.async_apply_profile(**value)
+            elif action == COMMAND_SCHEDULE:
+                coordinator.async_schedule(**value)
+            else:
+                coordinator.async_cancel_scheduled(value)
+        except Exception as err:
+            _LOGGER.warning(
+                "Relayed %s failed for stove %s: %s", action, coordinator.token[:4], err
+            )
+
+    # Subscriber side.
+
+    @callback
+    def _async_state_received(self, msg: mqtt.ReceiveMessage) -> None:
+        try:
+            state = StoveState.from_dict(json.loads(msg.payload)["state"])
+        except (ValueError, TypeError, KeyError):
+            _LOGGER.warning("Ignoring malformed relay snapshot on %s", msg.topic)
+            return
+        self.received += 1
+        self.live = True
+        self._received.set()
+        self._cancel_stale_timer()
+        self._stale_timer = async_call_later(
+            self._hass, RELAY_STALE_AFTER, self._async_stale
+        )
+        self._coordinator.async_relay_update(state)
+
+    @callback
+    def _async_availability_received(self, msg: mqtt.ReceiveMessage) -> None:
+        if msg.payload == OFFLINE and self.live:
+            self._set_unavailable("the relay publisher went offline")
+
+    @callback
+    def _async_stale(self, _now) -> None:
+        self._stale_timer = None
+        self._set_unavailable(f"no relayed snapshot for {RELAY_STALE_AFTER} s")
+
+    def _set_unavailable(self, reason: str) -> None:
+        self.live = False
+        self._cancel_stale_timer()
+        self._coordinator.async_relay_unavailable(reason)
+
+    def _cancel_stale_timer(self) -> None:
+        if self._stale_timer is not None:
+            self._stale_timer()
+            self._stale_timer = None
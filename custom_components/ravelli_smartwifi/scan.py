@@ -0,0 +1,223 @@
+"""Poll many stoves from the command line, without Home Assistant.
+
+Reads API tokens (one per line, ``#`` comments allowed) and prints one JSON
+line per stove as soon as its poll completes::
+
+    python tools/ravelli_scan.py tokens.txt --concurrency 64 --rate 20
+    python tools/ravelli_scan.py tokens.txt --watch 60 > changes.jsonl
+
+All stoves share one keep-alive connection pool. ``--watch`` polls in a
+loop and only prints snapshots that changed since the previous round.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from typing import IO, Dict, Iterable, Iterator, List
+
+import aiohttp
+
+from . import api
+from .const import (
+    DEFAULT_BASE_URL,
+    DEFAULT_POLL_BUDGET,
+    HOST_RATE_BURST,
+    POOL_DNS_CACHE_TTL,
+    POOL_KEEPALIVE_TIMEOUT,
+)
+from .metrics import LatencyHistogram
+from .record import TrafficRecorder
+from .state import StoveState
+
+
+def _parse_args(argv: List[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="ravelli_scan", description=__doc__.splitlines()[0]
+    )
+    parser.add_argument("tokens", help="file with one API token per line, - for stdin")
+    parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
+    parser.add_argument(
+        "--concurrency", type=int, default=32, help="stoves polled at once"
+    )
+    parser.add_argument(
+        "--rate", type=float, default=20.0, help="requests/s, 0 = unlimited"
+    )
+    parser.add_argument("--burst", type=int, default=HOST_RATE_BURST)
+    parser.add_argument(
+        "--budget", type=float, default=DEFAULT_POLL_BUDGET, help="seconds per poll"
+    )
+    parser.add_argument(
+        "--watch",
+        type=float,
+        metavar="SECONDS",
+        help="poll every SECONDS and only print changes",
+    )
+    parser.add_argument(
+        "--show-tokens",
+        action="store_true",
+        help="print full tokens instead of a prefix",
+    )
+    parser.add_argument(
+        "--record", metavar="PATH", help="append the API traffic to a capture file"
+    )
+    parser.add_argument("--debug", action="store_true")
+    return parser.parse_args(argv)
+
+
+def _read_tokens(stream: IO[str]) -> Iterator[str]:
+    seen = set()
+    for line in stream:
+        token = line.split("#", 1)[0].strip()
+        if token and token not in seen:
+            seen.add(token)
+            yield token
+
+
+class FleetScanner:
+    """Poll a set of stoves with bounded concurrency and stream the results."""
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        args: argparse.Namespace,
+        out: IO[str],
+        recorder: TrafficRecorder | None = None,
+    ) -> None:
+        self._session = session
+        self._args = args
+        self._out = out
+        self._recorder = recorder
+        self._clients: Dict[str, api.RavelliSmartWifiClient] = {}
+        self._last: Dict[str, StoveState | str] = {}
+        self.latency = LatencyHistogram()
+        self.polled = 0
+        self.failed = 0
+        self.emitted = 0
+
+    def _client(self, token: str) -> api.RavelliSmartWifiClient:
+        client = self._clients.get(token)
+        if client is None:
+            client = api.RavelliSmartWifiClient(
+                self._session,
+                self._args.base_url,
+                token,
+                debug=self._args.debug,
+                poll_budget=self._args.budget,
+                recorder=self._recorder,
+            )
+            # Only watch mode polls a stove again; keep its field cache.
+            if self._args.watch:
+                self._clients[token] = client
+        return client
+
+    async def async_scan(self, tokens: Iterable[str]) -> None:
+        """Poll every token once; results are written as they complete."""
+        queue: asyncio.Queue[str | None] = asyncio.Queue(self._args.concurrency * 2)
+        workers = [
+            asyncio.create_task(self._worker(queue))
+            for _ in range(self._args.concurrency)
+        ]
+        for token in tokens:
+            await queue.put(token)
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+
+    async def _worker(self, queue: asyncio.Queue) -> None:
+        while (token := await queue.get()) is not None:
+            await self._poll(token)
+
+    async def _poll(self, token: str) -> None:
+        started = time.monotonic()
+        record = {
+            "time": round(time.time(), 3),
+            "token": token if self._args.show_tokens else f"{token[:8]}…",
+        }
+        try:
+            state = await self._client(token).async_get_status()
+        except Exception as err:
+            self.failed += 1
+            current: StoveState | str = f"{type(err).__name__}: {err}"
+            record.update(ok=False, error=current)
+        else:
+            current = state
+            record.update(ok=True, state=state.as_dict())
+        elapsed = time.monotonic() - started
+        self.polled += 1
+        self.latency.add(elapsed)
+        record["elapsed_ms"] = round(elapsed * 1000, 1)
+
+        if self._args.watch and self._last.get(token) == current:
+            return
+        self._last[token] = current
+        self._out.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        self._out.flush()
+        self.emitted += 1
+
+    def summary(self) -> Dict[str, object]:
+        return {
+            "polled": self.polled,
+            "failed": self.failed,
+            "emitted": self.emitted,
+            "latency_p50_ms": _ms(self.latency.quantile(0.50)),
+            "latency_p95_ms": _ms(self.latency.quantile(0.95)),
+            "latency_max_ms": _ms(self.latency.max if self.latency.count else None),
+        }
+
+
+def _ms(seconds: float | None) -> float | None:
+    return None if seconds is None else round(seconds * 1000, 1)
+
+
+async def _async_main(args: argparse.Namespace) -> int:
+    # Scans wait for their turn instead of shedding polls like the integration.
+    api.configure_rate_limits(args.rate, args.burst, float("inf"))
+    if args.tokens == "-":
+        tokens = list(_read_tokens(sys.stdin))
+    else:
+        with open(args.tokens, encoding="utf-8") as stream:
+            tokens = list(_read_tokens(stream))
+
+    connector = aiohttp.TCPConnector(
+        limit=args.concurrency * 2,
+        ttl_dns_cache=POOL_DNS_CACHE_TTL,
+        keepalive_timeout=POOL_KEEPALIVE_TIMEOUT,
+    )
+    recorder = TrafficRecorder(args.record) if args.record else None
+    async with aiohttp.ClientSession(connector=connector) as session:
+        scanner = FleetScanner(session, args, sys.stdout, recorder)
+        try:
+            while True:
+                started = time.monotonic()
+                await scanner.async_scan(tokens)
+                if not args.watch:
+                    break
+                elapsed = time.monotonic() - started
+                await asyncio.sleep(max(0.0, args.watch - elapsed))
+        finally:
+            if recorder is not None:
+                await recorder.async_close()
+            print(json.dumps({"summary": scanner.summary()}), file=sys.stderr)
+    return 0 if scanner.failed < scanner.polled or not tokens else 1
+
+
+def main(argv: List[str] | None = None) -> int:
+    args = _parse_args(argv)
+    logging.basicConfig(
+        level=logging.DEBUG if args.debug else logging.WARNING,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+        stream=sys.stderr,
+    )
+    try:
+        return asyncio.run(_async_main(args))
+    except KeyboardInterrupt:
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())
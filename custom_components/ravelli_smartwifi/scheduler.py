@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, fields
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List
+import uuid
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import SCHEDULER_MAX_ATTEMPTS, SCHEDULER_WATCH_INTERVAL
+from .state import STATUS_OFF, StoveState
+from .storage import RavelliStore
+
+_LOGGER = logging.getLogger(__name__)
+
+ACTION_TURN_ON = "turn_on"
+ACTION_TURN_OFF = "turn_off"
+ACTION_SET_POWER = "set_power"
+ACTION_SET_TEMPERATURE = "set_temperature"
+ACTIONS = (ACTION_TURN_ON, ACTION_TURN_OFF, ACTION_SET_POWER, ACTION_SET_TEMPERATURE)
+
+
+@dataclass
+class ScheduledCommand:
+    """A command sent once its conditions hold.
+
+    ``when_status`` waits for the stove to report that status code,
+    ``not_before`` (wall-clock seconds) for a point in time; a command with
+    both waits for both.
+    """
+
+    id: str
+    action: str
+    value: Any = None
+    when_status: int | None = None
+    not_before: float | None = None
+    attempts: int = 0
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ScheduledCommand":
+        return cls(**{f.name: data[f.name] for f in fields(cls) if f.name in data})
+
+    def is_due(self, state: StoveState, now: float) -> bool:
+        if self.not_before is not None and now < self.not_before:
+            return False
+        return self.when_status is None or state.status_code == self.when_status
+
+    def is_satisfied(self, state: StoveState) -> bool:
+        """True when the stove is already where the command would take it."""
+        if self.action == ACTION_TURN_ON:
+            return state.is_on
+        if self.action == ACTION_TURN_OFF:
+            return state.status_code == STATUS_OFF
+        if self.action == ACTION_SET_POWER:
+            return state.power == self.value
+        return state.set_temp == self.value
+
+    def describe(self) -> str:
+        text = self.action if self.value is None else f"{self.action} {self.value}"
+        if self.when_status is not None:
+            text = f"{text} when status={self.when_status}"
+        if self.not_before is not None:
+            at = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.not_before))
+            text = f"{text} after {at}"
+        return text
+
+
+class RavelliCommandScheduler:
+    """Persistent per-stove list of commands waiting for a state or a time.
+
+    Commands are checked against every new snapshot. While one waits for a
+    status and the stove is in transition (starting up or in final cleaning,
+    so the status is about to change), ``next_check`` asks for a poll every
+    few seconds; otherwise the adaptive interval applies. A timed command
+    requests a poll at its due time, so it fires right after it.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        store: RavelliStore | None,
+        execute: Callable[[str, Any], Awaitable[None]],
+        request_poll: Callable[[float], None],
+        name: str,
+    ) -> None:
+        self._hass = hass
+        self._store = store
+        self._execute = execute
+        self._request_poll = request_poll
+        self._name = name
+        self._commands: List[ScheduledCommand] = []
+        # Last snapshot evaluated, to tell whether a status is imminent.
+        self._state: StoveState | None = None
+        self._timers: Dict[str, CALLBACK_TYPE] = {}
+        if store is not None:
+            self._commands = [
+                ScheduledCommand.from_dict(data) for data in store.scheduled
+            ]
+        for command in self._commands:
+            self._arm(command)
+
+    @property
+    def commands(self) -> List[ScheduledCommand]:
+        return list(self._commands)
+
+    def has(self, action: str, when_status: int | None = None) -> bool:
+        return any(
+            command.action == action
+            and (when_status is None or command.when_status == when_status)
+            for command in self._commands
+        )
+
+    def describe(self) -> tuple[str, ...]:
+        return tuple(command.describe() for command in self._commands)
+
+    def next_check(self) -> float | None:
+        """Seconds until a poll is needed to fire the next command, if any.
+
+        Never less than ``SCHEDULER_WATCH_INTERVAL``, doubled after each
+        failed send: a due command that cannot fire (send rejected, status
+        not refreshed) must not turn into back-to-back polls. The poll at a
+        timed command's due time comes from its timer.
+        """
+        now = time.time()
+        in_transition = self._state is not None and (
+            self._state.is_final_cleaning or self._state.is_starting
+        )
+        delays = []
+        for command in self._commands:
+            if command.when_status is not None and not in_transition:
+                # A steady stove can keep its status for hours.
+                continue
+            delay = max(0.0, (command.not_before or now) - now)
+            delays.append(
+                max(delay, SCHEDULER_WATCH_INTERVAL * 2**command.attempts)
+            )
+        return min(delays, default=None)
+
+    @callback
+    def async_add(
+        self,
+        action: str,
+        value: Any = None,
+        when_status: int | None = None,
+        not_before: float | None = None,
+    ) -> str:
+        """Schedule a command, replacing a pending one with the same action
+        and conditions."""
+        self.async_cancel(action, when_status=when_status, not_before=not_before)
+        command = ScheduledCommand(
+            uuid.uuid4().hex, action, value, when_status, not_before
+        )
+        self._commands.append(command)
+        _LOGGER.info("Stove %s: scheduled %s", self._name, command.describe())
+        self._arm(command)
+        self._async_persist()
+        self._request_poll(self.next_check() or 0.0)
+        return command.id
+
+    @callback
+    def async_cancel(
+        self,
+        action: str | None = None,
+        command_id: str | None = None,
+        **conditions: Any,
+    ) -> int:
+        """Drop the pending commands matching every given criterion."""
+        kept = []
+        dropped = 0
+        for command in self._commands:
+            if (
+                (action is None or command.action == action)
+                and (command_id is None or command.id == command_id)
+                and all(
+                    getattr(command, key) == value for key, value in conditions.items()
+                )
+            ):
+                self._disarm(command)
+                dropped += 1
+            else:
+                kept.append(command)
+        if dropped:
+            self._commands = kept
+            self._async_persist()
+        return dropped
+
+    async def async_evaluate(self, state: StoveState) -> None:
+        """Send every command due for ``state`` and drop obsolete ones."""
+        self._state = state
+        if "status" in state.stale_fields:
+            # Never act on a status this poll could not refresh.
+            return
+        now = time.time()
+        changed = False
+        for command in list(self._commands):
+            due = command.is_due(state, now)
+            # A command waiting for a status is moot once the stove got there
+            # another way (e.g. ignited by hand during final cleaning); a
+            # timed one is only checked when it comes due.
+            waiting = due or command.when_status is not None
+            if waiting and command.is_satisfied(state):
+                _LOGGER.debug("Stove %s: dropping %s", self._name, command.describe())
+            elif due:
+                try:
+                    await self._execute(command.action, command.value)
+                except Exception as err:
+                    command.attempts += 1
+                    _LOGGER.warning(
+                        "Stove %s: scheduled %s failed (%d/%d): %s",
+                        self._name,
+                        command.describe(),
+                        command.attempts,
+                        SCHEDULER_MAX_ATTEMPTS,
+                        err,
+                    )
+                    changed = True
+                    if command.attempts < SCHEDULER_MAX_ATTEMPTS:
+                        continue
+                else:
+                    _LOGGER.info(
+                        "Stove %s: sent scheduled %s", self._name, command.describe()
+                    )
+            else:
+                continue
+            self._disarm(command)
+            if command in self._commands:  # not cancelled while it was sent
+                self._commands.remove(command)
+            changed = True
+        if changed:
+            self._async_persist()
+
+    @callback
+    def async_shutdown(self) -> None:
+        for cancel in self._timers.values():
+            cancel()
+        self._timers.clear()
+
+    def _arm(self, command: ScheduledCommand) -> None:
+        if command.not_before is None:
+            return
+
+        @callback
+        def _due(_now) -> None:
+            self._timers.pop(command.id, None)
+            self._request_poll(0.0)
+
+        delay = max(0.0, command.not_before - time.time())
+        self._timers[command.id] = async_call_later(self._hass, delay, _due)
+
+    def _disarm(self, command: ScheduledCommand) -> None:
+        if (cancel := self._timers.pop(command.id, None)) is not None:
+            cancel()
+
+    @callback
+    def _async_persist(self) -> None:
+        if self._store is not None:
+            self._store.async_save_scheduled(
+                [asdict(command) for command in self._commands]
+            )
@@ -1,12 +1,36 @@
 from __future__ import annotations
 
-from homeassistant.components.sensor import SensorEntity
-from homeassistant.const import UnitOfTemperature
-from homeassistant.helpers.device_registry import DeviceInfo
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+import time
+
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
+from homeassistant.const import (
+    EntityCategory,
+    UnitOfMass,
+    UnitOfTemperature,
+    UnitOfTime,
+)
 
 from .const import DOMAIN
 from .coordinator import RavelliCoordinator
+from .counters import (
+    COUNTERS_KEY,
+    COUNTER_BURNER_HOURS,
+    COUNTER_CLEANINGS,
+    COUNTER_IGNITIONS,
+    COUNTER_PELLETS,
+)
+from .entity import RavelliEntity
+from .history import FIELDS as HISTORY_FIELDS
+
+# Window of the history aggregates shown as sensor attributes.
+HISTORY_WINDOW = 3600
+HISTORY_ATTRIBUTES = frozenset(
+    f"{name}_1h" for name in ("min", "max", "mean", "slope")
+)
 
 SENSORS = (
     ("ambient_temp", "Ambient Temperature", "ambient_temp", UnitOfTemperature.CELSIUS),
@@ -19,16 +43,49 @@ SENSORS = (
     ("pending_ignition", "Pending Ignition", "pending_ignition", None),
 )
 
+# Client instrumentation, disabled by default. Latencies are reported in ms.
+METRIC_SENSORS = (
+    ("api_requests", "API Requests", lambda m: m.requests, None),
+    ("api_errors", "API Errors", lambda m: m.errors, None),
+    ("api_latency_p50", "API Latency p50", lambda m: _ms(m.latency_quantile(0.50)), UnitOfTime.MILLISECONDS),
+    ("api_latency_p95", "API Latency p95", lambda m: _ms(m.latency_quantile(0.95)), UnitOfTime.MILLISECONDS),
+    ("poll_duration_p95", "Poll Duration p95", lambda m: _ms(m.polls.quantile(0.95)), UnitOfTime.MILLISECONDS),
+)
+
+# Lifetime counters kept by the coordinator: key, name, unit, device class,
+# display precision.
+COUNTER_SENSORS = (
+    (COUNTER_BURNER_HOURS, "Burner Hours", UnitOfTime.HOURS, SensorDeviceClass.DURATION, 2),
+    (COUNTER_IGNITIONS, "Ignitions", None, None, 0),
+    (COUNTER_CLEANINGS, "Final Cleanings", None, None, 0),
+    (COUNTER_PELLETS, "Pellet Consumption", UnitOfMass.KILOGRAMS, SensorDeviceClass.WEIGHT, 1),
+)
+
+
+def _ms(seconds: float | None) -> int | None:
+    return None if seconds is None else round(seconds * 1000)
+
+
 async def async_setup_entry(hass, entry, async_add_entities):
     coordinator: RavelliCoordinator = hass.data[DOMAIN][entry.entry_id]
     entities = [
         RavelliSensor(coordinator, key, name, translation_key, unit)
         for key, name, translation_key, unit in SENSORS
     ]
-    async_add_entities(entities, True)
+    entities.extend(
+        RavelliCounterSensor(coordinator, *description)
+        for description in COUNTER_SENSORS
+    )
+    entities.extend(
+        RavelliMetricSensor(coordinator, key, name, value_fn, unit)
+        for key, name, value_fn, unit in METRIC_SENSORS
+    )
+    async_add_entities(entities)
 
-class RavelliSensor(CoordinatorEntity, SensorEntity):
+class RavelliSensor(RavelliEntity, SensorEntity):
     _attr_has_entity_name = True
+    # Derived from the in-memory history; the recorder already has the values.
+    _unrecorded_attributes = HISTORY_ATTRIBUTES
 
     def __init__(
         self,
@@ -40,6 +97,7 @@ class RavelliSensor(CoordinatorEntity, SensorEntity):
     ):
         super().__init__(coordinator)
         self._key = key
+        self._watched_keys = frozenset({key})
         self._attr_name = name
         self._attr_translation_key = translation_key
         self._unit = unit
@@ -54,14 +112,49 @@ class RavelliSensor(CoordinatorEntity, SensorEntity):
 
     @property
     def native_value(self):
-        return self.coordinator.data.get(self._key)
+        return getattr(self.coordinator.data, self._key)
 
     @property
-    def device_info(self) -> DeviceInfo:
-        return DeviceInfo(
-            identifiers={(DOMAIN, self.coordinator.token)},
-            manufacturer="Ravelli",
-            model="Smart Wi‑Fi",
-            name=self.coordinator.device_name,
-            configuration_url=self.coordinator.base_url,
+    def extra_state_attributes(self):
+        if self._key not in HISTORY_FIELDS:
+            return None
+        window = self.coordinator.history.window(
+            self._key, HISTORY_WINDOW, time.time()
         )
+        window.pop("count")
+        return {f"{name}_1h": value for name, value in window.items()}
+
+
+class RavelliMetricSensor(RavelliSensor):
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, coordinator: RavelliCoordinator, key, name, value_fn, unit):
+        super().__init__(coordinator, key, name, key, unit)
+        # Counters move on every request, not with the snapshot.
+        self._watched_keys = None
+        self._value_fn = value_fn
+        if key in ("api_requests", "api_errors"):
+            self._attr_state_class = SensorStateClass.TOTAL_INCREASING
+        else:
+            self._attr_state_class = SensorStateClass.MEASUREMENT
+
+    @property
+    def native_value(self):
+        return self._value_fn(self.coordinator.client.metrics)
+
+
+class RavelliCounterSensor(RavelliSensor):
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+
+    def __init__(
+        self, coordinator: RavelliCoordinator, key, name, unit, device_class, precision
+    ):
+        super().__init__(coordinator, key, name, key, unit)
+        self._watched_keys = frozenset({COUNTERS_KEY})
+        self._attr_device_class = device_class
+        self._attr_suggested_display_precision = precision
+
+    @property
+    def native_value(self):
+        return self.coordinator.counters.values[self._key]
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from typing import Any, Dict
+
+import voluptuous as vol
+from homeassistant.helpers import config_validation as cv
+
+from .scheduler import ACTION_SET_POWER, ACTION_SET_TEMPERATURE, ACTIONS
+
+POWER = vol.All(vol.Coerce(int), vol.Range(min=1, max=5))
+TEMPERATURE = vol.All(vol.Coerce(float), vol.Range(min=5, max=30))
+
+# Actions that take a value, and how that value is checked.
+ACTION_VALUES = {ACTION_SET_POWER: POWER, ACTION_SET_TEMPERATURE: TEMPERATURE}
+
+COMMAND_FIELDS = {
+    vol.Required("action"): vol.In(ACTIONS),
+    vol.Optional("value"): vol.Any(None, vol.Coerce(float)),
+    vol.Optional("when_status"): vol.Any(None, vol.Coerce(int)),
+}
+
+SCHEDULE_COMMAND_FIELDS = {**COMMAND_FIELDS, vol.Optional("at"): cv.datetime}
+
+CANCEL_SCHEDULED_FIELDS = {vol.Optional("action"): vol.In(ACTIONS)}
+
+APPLY_PROFILE_FIELDS = {
+    vol.Optional("is_on"): cv.boolean,
+    vol.Optional("power"): POWER,
+    vol.Optional("temperature"): TEMPERATURE,
+}
+
+
+def command_value(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Require a valid value for the actions that take one, drop it otherwise."""
+    data = dict(data)
+    check = ACTION_VALUES.get(data["action"])
+    if check is None:
+        data.pop("value", None)
+    elif data.get("value") is None:
+        raise vol.Invalid(f"value is required for {data['action']}", path=["value"])
+    else:
+        try:
+            data["value"] = check(data["value"])
+        except vol.Invalid as err:
+            raise vol.Invalid(
+                f"invalid value for {data['action']}: {err.msg}", path=["value"]
+            ) from err
+    return data
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field, fields, replace
+from typing import Any, Dict, Mapping, Tuple
+
+STATUS_OFF = 0
+STATUS_FINAL_CLEANING = 6
+# Start-up sequence before the stove settles into work: start/check-up,
+# pellet loading and ignition.
+STATUS_STARTING = frozenset({1, 2, 3})
+
+
+def derive_is_on(status_code: int | None, status_text: str | None) -> bool:
+    """Return True when the stove is actively heating or igniting."""
+    if status_code in (None, STATUS_OFF):
+        return False
+    if status_code == STATUS_FINAL_CLEANING:
+        return False
+    if status_text and status_code is None:
+        normalized = status_text.upper()
+        if any(keyword in normalized for keyword in ("CLEANING", "OFF", "STOP")):
+            return False
+    return True
+
+
+def derive_is_starting(status_code: int | None, status_text: str | None) -> bool:
+    """Return True while the stove runs its ignition/start-up sequence."""
+    if status_code is not None:
+        return status_code in STATUS_STARTING
+    normalized = (status_text or "").upper()
+    return any(keyword in normalized for keyword in ("IGNIT", "START", "LOAD"))
+
+
+def derive_effective_state(
+    status_code: int | None,
+    raw_is_on: bool | None,
+    pending_ignition: bool,
+    optimistic_on: bool | None = None,
+) -> bool:
+    """Return the on/off state shown to users.
+
+    A queued ignition counts as on, and the value written by an on/off
+    command wins over the status until a read confirms it.
+    """
+    if optimistic_on is not None:
+        return optimistic_on
+    if status_code in (None, STATUS_OFF):
+        return False
+    if status_code == STATUS_FINAL_CLEANING:
+        return pending_ignition
+    if raw_is_on is not None:
+        return bool(raw_is_on)
+    return True
+
+
+@dataclass(frozen=True, slots=True)
+class StoveState:
+    """Immutable snapshot of one stove, as produced by a poll."""
+
+    status_code: int | None = None
+    status: str | None = None
+    error: Any = None
+    error_description: str | None = None
+    power: float | None = None
+    set_temp: float | None = None
+    ambient_temp: float | None = None
+    is_on: bool = False
+    pending_ignition: bool = False
+    # On/off value of a command sent since the status was last read.
+    optimistic_on: bool | None = None
+    # Descriptions of the commands waiting in the stove's scheduler.
+    scheduled_commands: Tuple[str, ...] = ()
+    # Wall-clock time each field was last read, and fields this poll could
+    # not refresh (they carry their last known value).
+    updated_at: Mapping[str, float | None] = field(default_factory=dict, compare=False)
+    stale_fields: Tuple[str, ...] = ()
+    # Derived once per snapshot instead of on every property access.
+    is_on_effective: bool = field(init=False, default=False)
+    is_final_cleaning: bool = field(init=False, default=False)
+    is_starting: bool = field(init=False, default=False)
+    # Wall-clock read time of the oldest value listed in ``stale_fields``.
+    stale_since: float | None = field(init=False, default=None)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self,
+            "is_on_effective",
+            derive_effective_state(
+                self.status_code, self.is_on, self.pending_ignition, self.optimistic_on
+            ),
+        )
+        object.__setattr__(
+            self, "is_final_cleaning", self.status_code == STATUS_FINAL_CLEANING
+        )
+        object.__setattr__(
+            self, "is_starting", derive_is_starting(self.status_code, self.status)
+        )
+        read_times = [
+            read_at
+            for name in self.stale_fields
+            if (read_at := self.updated_at.get(name)) is not None
+        ]
+        object.__setattr__(self, "stale_since", min(read_times, default=None))
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "StoveState":
+        known = {name: data[name] for name in _INIT_FIELDS if name in data}
+        for name in ("stale_fields", "scheduled_commands"):
+            if name in known:
+                known[name] = tuple(known[name])
+        return cls(**known)
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = {name: getattr(self, name) for name in _ALL_FIELDS}
+        data["updated_at"] = dict(self.updated_at)
+        data["stale_fields"] = list(self.stale_fields)
+        data["scheduled_commands"] = list(self.scheduled_commands)
+        return data
+
+    def replace(self, **changes: Any) -> "StoveState":
+        return replace(self, **changes)
+
+    def diff(self, previous: "StoveState | None") -> frozenset[str]:
+        """Return the names of the compared fields that differ from ``previous``."""
+        if previous is None:
+            return _COMPARED_FIELDS
+        return frozenset(
+            name
+            for name in _COMPARED_FIELDS
+            if getattr(self, name) != getattr(previous, name)
+        )
+
+
+_ALL_FIELDS = tuple(f.name for f in fields(StoveState))
+_INIT_FIELDS = tuple(f.name for f in fields(StoveState) if f.init)
+_COMPARED_FIELDS = frozenset(f.name for f in fields(StoveState) if f.compare)
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+from .state import StoveState
+
+# Fields marked stale on a snapshot restored from storage.
+_RESTORED_STALE = ("status", "power", "set_temp", "ambient_temp")
+
+
+class RavelliStore:
+    """Per-entry persisted state, written lazily in the background.
+
+    Snapshots and counters are written at most ``STORAGE_SAVE_DELAY`` after
+    the first change since the previous write, however often they change;
+    scheduled commands are written at once.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._store: Store[Dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}"
+        )
+        self._data: Dict[str, Any] = {}
+        self._save_scheduled = False
+
+    async def async_load(self) -> None:
+        self._data = await self._store.async_load() or {}
+
+    @property
+    def snapshot(self) -> StoveState | None:
+        """Last good snapshot, every field flagged stale until the next poll."""
+        stored = self._data.get("snapshot")
+        if not stored:
+            return None
+        return StoveState.from_dict(stored).replace(
+            pending_ignition=False,
+            optimistic_on=None,
+            stale_fields=_RESTORED_STALE,
+        )
+
+    @callback
+    def async_save_snapshot(self, state: StoveState) -> None:
+        self._data["snapshot"] = state.as_dict()
+        self._async_schedule_save()
+
+    @property
+    def scheduled(self) -> List[Dict[str, Any]]:
+        return list(self._data.get("scheduled", ()))
+
+    @callback
+    def async_save_scheduled(self, commands: List[Dict[str, Any]]) -> None:
+        self._data["scheduled"] = commands
+        # Pending commands must survive a crash: write now, along with any
+        # snapshot or counters waiting for their write.
+        self._save_scheduled = True
+        self._store.async_delay_save(self._data_to_save, 0)
+
+    @property
+    def counters(self) -> Dict[str, Any]:
+        return dict(self._data.get("counters", {}))
+
+    @callback
+    def async_save_counters(self, counters: Dict[str, Any]) -> None:
+        self._data["counters"] = counters
+        self._async_schedule_save()
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        # Store.async_delay_save moves a pending write to the latest deadline;
+        # called on every poll, it would never write. Later changes ride along
+        # with the write already scheduled instead.
+        if not self._save_scheduled:
+            self._save_scheduled = True
+            self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+    def _data_to_save(self) -> Dict[str, Any]:
+        self._save_scheduled = False
+        return self._data
+
+    async def async_remove(self) -> None:
+        await self._store.async_remove()
@@ -1,26 +1,63 @@
 from __future__ import annotations
 
+import voluptuous as vol
 from homeassistant.components.switch import SwitchEntity
-from homeassistant.helpers.device_registry import DeviceInfo
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.helpers import config_validation as cv, entity_platform
+from homeassistant.util import dt as dt_util
 
 from .const import DOMAIN
 from .coordinator import RavelliCoordinator
+from .entity import RavelliEntity
+from .services import (
+    APPLY_PROFILE_FIELDS,
+    CANCEL_SCHEDULED_FIELDS,
+    SCHEDULE_COMMAND_FIELDS,
+    command_value,
+)
 
 PARALLEL_UPDATES = 0
 
+SERVICE_SCHEDULE_COMMAND = "schedule_command"
+SERVICE_CANCEL_SCHEDULED_COMMANDS = "cancel_scheduled_commands"
+SERVICE_APPLY_PROFILE = "apply_profile"
+
 
 async def async_setup_entry(hass, entry, async_add_entities):
     coordinator: RavelliCoordinator = hass.data[DOMAIN][entry.entry_id]
-    async_add_entities([RavelliStoveSwitch(coordinator)], True)
+    async_add_entities([RavelliStoveSwitch(coordinator)])
 
+    platform = entity_platform.async_get_current_platform()
+    platform.async_register_entity_service(
+        SERVICE_SCHEDULE_COMMAND,
+        vol.All(cv.make_entity_service_schema(SCHEDULE_COMMAND_FIELDS), command_value),
+        "async_schedule_command",
+    )
+    platform.async_register_entity_service(
+        SERVICE_CANCEL_SCHEDULED_COMMANDS,
+        CANCEL_SCHEDULED_FIELDS,
+        "async_cancel_scheduled_commands",
+    )
+    # Called once per targeted stove, all stoves in parallel.
+    platform.async_register_entity_service(
+        SERVICE_APPLY_PROFILE, APPLY_PROFILE_FIELDS, "async_apply_profile"
+    )
 
-class RavelliStoveSwitch(CoordinatorEntity, SwitchEntity):
+class RavelliStoveSwitch(RavelliEntity, SwitchEntity):
     _attr_has_entity_name = False
+    _watched_keys = frozenset(
+        {
+            "is_on_effective",
+            "status",
+            "status_code",
+            "pending_ignition",
+            "scheduled_commands",
+            "stale_fields",
+            "stale_since",
+        }
+    )
 
     def __init__(self, coordinator: RavelliCoordinator) -> None:
         super().__init__(coordinator)
-        self._client = coordinator.client
         self._attr_name = coordinator.device_name
 
     @property
@@ -32,33 +69,41 @@ class RavelliStoveSwitch(CoordinatorEntity, SwitchEntity):
         return self.coordinator.effective_is_on
 
     async def async_turn_on(self, **kwargs):
-        if self.coordinator.is_final_cleaning:
-            self.coordinator.queue_ignition_after_cleaning()
-        else:
-            self.coordinator.cancel_pending_ignition()
-        await self._client.async_turn_on()
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_turn_on()
 
     async def async_turn_off(self, **kwargs):
-        self.coordinator.cancel_pending_ignition()
-        await self._client.async_turn_off()
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_turn_off()
 
-    @property
-    def device_info(self) -> DeviceInfo:
-        return DeviceInfo(
-            identifiers={(DOMAIN, self.coordinator.token)},
-            manufacturer="Ravelli",
-            model="Smart Wi‑Fi",
-            name=self.coordinator.device_name,
-            configuration_url=self.coordinator.base_url,
+    async def async_schedule_command(
+        self, action, value=None, when_status=None, at=None
+    ) -> None:
+        self.coordinator.async_schedule(
+            action,
+            value,
+            when_status,
+            dt_util.as_timestamp(dt_util.as_local(at)) if at is not None else None,
         )
 
+    async def async_cancel_scheduled_commands(self, action=None) -> None:
+        self.coordinator.async_cancel_scheduled(action)
+
+    async def async_apply_profile(
+        self, is_on=None, power=None, temperature=None
+    ) -> None:
+        await self.coordinator.async_apply_profile(is_on, power, temperature)
+
     @property
     def extra_state_attributes(self):
-        data = self.coordinator.data or {}
+        data = self.coordinator.data
         return {
-            "status": data.get("status"),
-            "status_code": data.get("status_code"),
+            "status": data.status,
+            "status_code": data.status_code,
             "pending_ignition": self.coordinator.pending_ignition,
+            "scheduled_commands": list(data.scheduled_commands),
+            "stale_fields": list(data.stale_fields),
+            "stale_since": (
+                dt_util.utc_from_timestamp(data.stale_since).isoformat()
+                if data.stale_since is not None
+                else None
+            ),
         }
@@ -0,0 +1,27 @@
+"""Make the integration importable without Home Assistant installed."""
+
+from __future__ import annotations
+
+import importlib.util
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+PACKAGE = "custom_components.ravelli_smartwifi"
+PACKAGE_DIR = REPO_ROOT / "custom_components" / "ravelli_smartwifi"
+
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+if importlib.util.find_spec("homeassistant") is None:
+    # The package __init__ imports Home Assistant; register bare packages so
+    # the HA-free modules (state, api, ...) load on their own.
+    for _name, _path in (
+        ("custom_components", PACKAGE_DIR.parent),
+        (PACKAGE, PACKAGE_DIR),
+    ):
+        if _name not in sys.modules:
+            _spec = importlib.util.spec_from_loader(_name, loader=None, is_package=True)
+            _module = importlib.util.module_from_spec(_spec)
+            _module.__path__ = [str(_path)]
+            sys.modules[_name] = _module
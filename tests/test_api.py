@@ -0,0 +1,102 @@
+"""Tests for the API client's request path."""
+
+import asyncio
+
+import aiohttp
+import pytest
+
+from custom_components.ravelli_smartwifi import api
+from custom_components.ravelli_smartwifi.errors import (
+    RavelliCircuitOpenError,
+    RavelliTransportError,
+)
+
+
+class _Response:
+    status = 200
+
+    def __init__(self, body: bytes) -> None:
+        self._body = body
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        return None
+
+
+class _DownSession:
+    """Session whose every request fails like a refused connection, unless
+    ``up`` is set."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.up = False
+
+    def get(self, url, **kwargs):
+        self.requests += 1
+        if not self.up:
+            raise aiohttp.ClientConnectionError("refused")
+        if "/GetStatus/" in url:
+            return _Response(b'{"Success":true,"Status":4,"StatusDescription":"WORK"}')
+        return _Response(b'{"Success":true,"Result":21}')
+
+
+def test_retries_count_as_one_circuit_failure(monkeypatch) -> None:
+    monkeypatch.setattr(api, "RETRY_BASE_DELAY", 0.0)
+    session = _DownSession()
+    client = api.RavelliSmartWifiClient(session, "https://retries.invalid/json", "t")
+
+    with pytest.raises(RavelliTransportError):
+        asyncio.run(client._call_status())
+
+    assert session.requests == api.RETRY_ATTEMPTS + 1
+    assert client.circuit.stats()["consecutive_failures"] == 1
+
+
+def test_poll_with_open_circuit_is_classified(monkeypatch) -> None:
+    monkeypatch.setattr(api, "RETRY_BASE_DELAY", 0.0)
+    session = _DownSession()
+    client = api.RavelliSmartWifiClient(session, "https://outage.invalid/json", "t")
+    for _ in range(api.CIRCUIT_FAILURE_THRESHOLD):
+        with pytest.raises(RavelliTransportError):
+            asyncio.run(client._call_status())
+    assert client.circuit.is_open
+
+    with pytest.raises(RavelliCircuitOpenError):
+        asyncio.run(client.async_get_status())
+
+
+def test_poll_with_open_circuit_serves_last_known_state(monkeypatch) -> None:
+    monkeypatch.setattr(api, "RETRY_BASE_DELAY", 0.0)
+    session = _DownSession()
+    session.up = True
+    client = api.RavelliSmartWifiClient(session, "https://stale.invalid/json", "t")
+    fresh = asyncio.run(client.async_get_status())
+    assert fresh.stale_fields == ()
+
+    session.up = False
+    for _ in range(api.CIRCUIT_FAILURE_THRESHOLD):
+        client.invalidate("status")
+        with pytest.raises(RavelliTransportError):
+            asyncio.run(client._call_status())
+    assert client.circuit.is_open
+
+    client.invalidate("status")
+    stale = asyncio.run(client.async_get_status())
+    assert stale.status_code == 4
+    assert "status" in stale.stale_fields
+    assert stale.stale_since == pytest.approx(fresh.updated_at["status"])
+
+
+def test_probe_sends_a_single_request() -> None:
+    session = _DownSession()
+    client = api.RavelliSmartWifiClient(session, "https://probe.invalid/json", "t")
+
+    with pytest.raises(RavelliTransportError):
+        asyncio.run(client.async_probe())
+
+    assert session.requests == 1
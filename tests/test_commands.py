@@ -0,0 +1,118 @@
+"""Tests for the per-stove command queue."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from custom_components.ravelli_smartwifi.commands import (
+    COMMAND_SET_TEMP,
+    COMMAND_SWITCH,
+    RavelliCommandQueue,
+)
+from custom_components.ravelli_smartwifi.errors import RavelliShutdownError
+
+
+class _Stove:
+    """Executes commands after a delay and keeps the written values."""
+
+    def __init__(self, values, delay: float = 0.01) -> None:
+        self.values = dict(values)
+        self.sent = []
+        self.drained = []
+        self.release = None
+        self._delay = delay
+
+    async def execute(self, kind, value) -> None:
+        self.sent.append((kind, value))
+        if self.release is not None:
+            await self.release.wait()
+        await asyncio.sleep(self._delay)
+        self.values[kind] = value
+
+    def is_current(self, kind, value) -> bool:
+        return self.values.get(kind) == value
+
+    async def on_drained(self, kinds) -> None:
+        self.drained.append(set(kinds))
+
+
+def _queue(stove: _Stove) -> RavelliCommandQueue:
+    loop = asyncio.get_running_loop()
+    hass = SimpleNamespace(
+        loop=loop, async_create_background_task=lambda coro, name: loop.create_task(coro)
+    )
+    return RavelliCommandQueue(
+        hass, stove.execute, stove.is_current, stove.on_drained, name="test"
+    )
+
+
+def test_superseded_values_are_coalesced() -> None:
+    async def run():
+        stove = _Stove({COMMAND_SET_TEMP: 20})
+        queue = _queue(stove)
+        first = asyncio.ensure_future(queue.async_submit(COMMAND_SET_TEMP, 21))
+        await asyncio.sleep(0.001)  # 21 is being sent
+        others = [
+            asyncio.ensure_future(queue.async_submit(COMMAND_SET_TEMP, value))
+            for value in (22, 23, 24)
+        ]
+        await asyncio.gather(first, *others)
+        return stove
+
+    stove = asyncio.run(run())
+    assert stove.sent == [(COMMAND_SET_TEMP, 21), (COMMAND_SET_TEMP, 24)]
+    assert stove.values[COMMAND_SET_TEMP] == 24
+
+
+def test_reverting_to_the_value_in_flight_drops_both() -> None:
+    async def run():
+        stove = _Stove({COMMAND_SWITCH: False})
+        queue = _queue(stove)
+        first = asyncio.ensure_future(queue.async_submit(COMMAND_SWITCH, True))
+        await asyncio.sleep(0.001)
+        await asyncio.gather(
+            first,
+            queue.async_submit(COMMAND_SWITCH, False),
+            queue.async_submit(COMMAND_SWITCH, True),
+        )
+        return stove
+
+    stove = asyncio.run(run())
+    assert stove.sent == [(COMMAND_SWITCH, True)]
+
+
+def test_reverting_to_the_stale_snapshot_is_still_sent() -> None:
+    # 21 is in flight while the snapshot still says 20: going back to 20
+    # must be sent, not treated as a no-op.
+    async def run():
+        stove = _Stove({COMMAND_SET_TEMP: 20})
+        queue = _queue(stove)
+        first = asyncio.ensure_future(queue.async_submit(COMMAND_SET_TEMP, 21))
+        await asyncio.sleep(0.001)
+        await asyncio.gather(
+            first,
+            queue.async_submit(COMMAND_SET_TEMP, 22),
+            queue.async_submit(COMMAND_SET_TEMP, 20),
+        )
+        return stove
+
+    stove = asyncio.run(run())
+    assert stove.sent == [(COMMAND_SET_TEMP, 21), (COMMAND_SET_TEMP, 20)]
+    assert stove.values[COMMAND_SET_TEMP] == 20
+
+
+def test_shutdown_fails_in_flight_and_pending_waiters() -> None:
+    async def run():
+        stove = _Stove({COMMAND_SET_TEMP: 20})
+        stove.release = asyncio.Event()
+        queue = _queue(stove)
+        inflight = asyncio.ensure_future(queue.async_submit(COMMAND_SET_TEMP, 21))
+        await asyncio.sleep(0.01)
+        pending = asyncio.ensure_future(queue.async_submit(COMMAND_SET_TEMP, 22))
+        await asyncio.sleep(0)
+        await queue.async_shutdown()
+        return await asyncio.gather(inflight, pending, return_exceptions=True)
+
+    results = asyncio.run(asyncio.wait_for(run(), 1))
+    assert all(isinstance(result, RavelliShutdownError) for result in results)
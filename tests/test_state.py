@@ -0,0 +1,32 @@
+"""Tests for the stove snapshot."""
+
+from custom_components.ravelli_smartwifi.state import (
+    StoveState,
+    derive_effective_state,
+)
+
+
+def test_turn_on_from_off_is_shown_until_confirmed() -> None:
+    off = StoveState(status_code=0, is_on=False)
+    assert off.is_on_effective is False
+
+    # Optimistic write-through after async_turn_on.
+    pending = off.replace(is_on=True, optimistic_on=True)
+    assert pending.is_on_effective is True
+
+    # The confirm read still reports status 0 and clears the flag.
+    confirmed = pending.replace(optimistic_on=None)
+    assert confirmed.is_on_effective is False
+
+
+def test_turn_off_from_running_is_shown_until_confirmed() -> None:
+    running = StoveState(status_code=4, is_on=True)
+    assert running.is_on_effective is True
+    assert running.replace(is_on=False, optimistic_on=False).is_on_effective is False
+
+
+def test_optimistic_value_wins_over_status() -> None:
+    assert derive_effective_state(0, False, False, True) is True
+    assert derive_effective_state(None, None, False, True) is True
+    assert derive_effective_state(4, True, False, False) is False
+    assert derive_effective_state(0, True, False) is False
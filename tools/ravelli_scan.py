@@ -0,0 +1,33 @@
+"""Run the integration's fleet scanner without Home Assistant installed.
+
+The package ``__init__`` imports Home Assistant, so the package is
+registered bare here and ``scan`` (which only needs aiohttp) is imported
+from it. See ``custom_components/ravelli_smartwifi/scan.py`` for usage.
+"""
+
+from __future__ import annotations
+
+import importlib
+import importlib.util
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+PACKAGE = "custom_components.ravelli_smartwifi"
+
+
+def _load_package() -> None:
+    sys.path.insert(0, str(REPO_ROOT))
+    for name, path in (
+        ("custom_components", REPO_ROOT / "custom_components"),
+        (PACKAGE, REPO_ROOT / "custom_components" / "ravelli_smartwifi"),
+    ):
+        spec = importlib.util.spec_from_loader(name, loader=None, is_package=True)
+        module = importlib.util.module_from_spec(spec)
+        module.__path__ = [str(path)]
+        sys.modules[name] = module
+
+
+if __name__ == "__main__":
+    _load_package()
+    sys.exit(importlib.import_module(f"{PACKAGE}.scan").main())